@@ -0,0 +1,52 @@
+import sys
+import os
+import json
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from settlement.models import Case, CaseState, OutcomeSignal
+from settlement.reconciliation import ingest_signals
+from settlement.audit import AuditSink, case_trace
+
+# Usage: python benchmarks/bench_audit_sink.py [cases]
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+
+def settled_cases():
+    cases = []
+    for i in range(N):
+        case = Case(case_id=f"case_{i}")
+        ingest_signals(case, [OutcomeSignal(case_id=case.case_id, source=f"oracle_{j}", outcome="YES") for j in range(3)])
+        case.state, case.final_outcome, case.settlement_id = CaseState.SETTLED, "YES", f"sid_{i}"
+        cases.append(case)
+    return cases
+
+
+def main():
+    print(f"\n--- bench_audit_sink ({N} case traces) ---")
+    cases = settled_cases()
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        for case in cases:
+            with open(os.path.join(tmp, f"trace_{case.case_id}.json"), "w", encoding="utf-8") as f:
+                json.dump(case_trace("bench", case), f, indent=2)
+        elapsed = time.perf_counter() - t0
+        print(f"json.dump per file:       {N / elapsed:10.0f} traces/sec")
+
+        for compress in (False, True):
+            sink = AuditSink(os.path.join(tmp, f"sink_{compress}"), compress=compress)
+            t0 = time.perf_counter()
+            for case in cases:
+                sink.write_trace("bench", case)
+            producer = time.perf_counter() - t0
+            sink.close()
+            total = time.perf_counter() - t0
+            size = sum(os.path.getsize(p) for p in sink.segments)
+            print(f"AuditSink compress={compress!s:<5}  {N / producer:10.0f} traces/sec on the caller, "
+                  f"{N / total:10.0f} incl. drain, {size / N:6.1f} B/trace")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import sys
+import os
+import time
+from random import Random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from settlement.models import Case, OutcomeSignal
+from settlement.reconciliation import ingest_signals, auto_reconcile, MajorityPolicy, WeightedPolicy
+from settlement import reconciliation
+
+# Usage: python benchmarks/bench_auto_reconcile.py [cases]
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+
+
+def conflicted_cases(seed: int = 1337):
+    rng = Random(seed)
+    cases = []
+    for i in range(N):
+        case = Case(case_id=f"case_{i}")
+        ingest_signals(case, [
+            OutcomeSignal(case_id=case.case_id, source="oracle_A", outcome="YES"),
+            OutcomeSignal(case_id=case.case_id, source="oracle_B", outcome="NO"),
+        ] + [
+            OutcomeSignal(case_id=case.case_id, source=f"agent_{j}", outcome=rng.choice(("YES", "NO")),
+                          confidence=rng.random())
+            for j in range(3)
+        ])
+        cases.append(case)
+    return cases
+
+
+def main():
+    print(f"\n--- bench_auto_reconcile ({N} IN_RECONCILIATION cases, numpy={'yes' if reconciliation.np is not None else 'no'}) ---")
+    for policy in (MajorityPolicy(), WeightedPolicy()):
+        cases = conflicted_cases()
+        t0 = time.perf_counter()
+        for case in cases:
+            policy.decide(case)
+        per_case = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        policy.decide_batch(cases)
+        batch = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        finalized = auto_reconcile(cases, policy)
+        total = time.perf_counter() - t0
+        print(f"{type(policy).__name__:<16} decide loop {per_case * 1e3:7.1f} ms   decide_batch {batch * 1e3:7.1f} ms   "
+              f"auto_reconcile {total * 1e3:7.1f} ms   finalized={len(finalized)}")
+
+
+if __name__ == "__main__":
+    main()
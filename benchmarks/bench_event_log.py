@@ -0,0 +1,53 @@
+import sys
+import os
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from settlement.models import Case, OutcomeSignal
+from settlement.reconciliation import ingest_signal, resolve_reconciliation
+from settlement.gate import attempt_settlement
+from settlement.store import EventLogStore
+
+# Usage: python benchmarks/bench_event_log.py [n_cases] [tail_cases]
+N_CASES = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+TAIL_CASES = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+
+
+def drive(store: EventLogStore, start: int, count: int) -> None:
+    for i in range(start, start + count):
+        case = Case(case_id=f"case_{i}")
+        store.put_case(case)
+        ingest_signal(case, OutcomeSignal(case_id=case.case_id, source="oracle_A", outcome="YES"))
+        ingest_signal(case, OutcomeSignal(case_id=case.case_id, source="oracle_B", outcome="YES"))
+        resolve_reconciliation(case, chosen_outcome="YES")
+        attempt_settlement(case)
+
+
+def main():
+    print(f"\n--- bench_event_log ({N_CASES} snapshotted cases + {TAIL_CASES} in log tail) ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EventLogStore(tmp, durability="none")
+
+        t0 = time.perf_counter()
+        drive(store, 0, N_CASES)
+        elapsed = time.perf_counter() - t0
+        print(f"journal:  {N_CASES / elapsed:10.0f} cases/sec (5 events/case, incl. ingest + settlement)")
+
+        t0 = time.perf_counter()
+        store.snapshot()
+        print(f"snapshot: {time.perf_counter() - t0:8.2f} s")
+
+        drive(store, N_CASES, TAIL_CASES)
+        store.close()
+
+        t0 = time.perf_counter()
+        recovered = EventLogStore(tmp)
+        elapsed = time.perf_counter() - t0
+        print(f"recover:  {elapsed:8.2f} s  ({len(recovered.cases) / elapsed:10.0f} cases/sec)")
+        recovered.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from settlement.models import Case, CaseState
+from settlement.gate import StripedSettlementGate
+
+# Usage: python benchmarks/bench_gate_contention.py [cases] [attempts_per_case]
+CASES = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+ATTEMPTS_PER_CASE = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+
+def run(threads: int) -> None:
+    cases = [Case(case_id=f"case_{i}", state=CaseState.FINAL, final_outcome="YES") for i in range(CASES)]
+    gate = StripedSettlementGate()
+    # Each case is attempted ATTEMPTS_PER_CASE times, spread across threads.
+    work = [cases[i % CASES] for i in range(CASES * ATTEMPTS_PER_CASE)]
+    chunks = [work[t::threads] for t in range(threads)]
+    seen = [dict() for _ in range(threads)]
+
+    def settle_chunk(t: int) -> None:
+        out = seen[t]
+        for case in chunks[t]:
+            out.setdefault(case.case_id, set()).add(gate.attempt_settlement(case))
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(settle_chunk, range(threads)))
+    elapsed = time.perf_counter() - t0
+
+    ids = {}
+    for out in seen:
+        for case_id, sids in out.items():
+            ids.setdefault(case_id, set()).update(sids)
+    violations = sum(1 for sids in ids.values() if len(sids) != 1)
+    print(f"threads={threads:>2}  {len(work) / elapsed:10.0f} attempts/sec  exactly-once violations={violations}")
+    if violations:
+        raise SystemExit("exactly-once violated")
+
+
+def main():
+    print(f"\n--- bench_gate_contention ({CASES} cases x {ATTEMPTS_PER_CASE} attempts) ---")
+    for threads in (1, 2, 4, 8, 16, 32, 64):
+        run(threads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import sys
+import os
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from settlement.models import Case, OutcomeSignal
+from settlement.reconciliation import ingest_signal, ingest_signals
+
+
+def make_signals(case_id: str, n: int):
+    return [
+        OutcomeSignal(case_id=case_id, source=f"agent_{i % 64}", outcome="YES" if i % 3 else "NO")
+        for i in range(n)
+    ]
+
+
+def run(n: int) -> float:
+    case = Case(case_id=f"bench_case_{n}")
+    signals = make_signals(case.case_id, n)
+    t0 = time.perf_counter()
+    for s in signals:
+        ingest_signal(case, s)
+    return time.perf_counter() - t0
+
+
+def run_batch(n: int) -> float:
+    case = Case(case_id=f"bench_batch_{n}")
+    signals = make_signals(case.case_id, n)
+    t0 = time.perf_counter()
+    ingest_signals(case, signals)
+    return time.perf_counter() - t0
+
+
+def main():
+    print("\n--- bench_ingest (signals per case) ---")
+    for n in (1_000, 2_500, 5_000, 10_000):
+        elapsed = run(n)
+        print(f"N={n:>6}  total={elapsed * 1e3:8.2f} ms  per_signal={elapsed / n * 1e6:6.2f} us")
+
+    print("\n--- bench_ingest (sequential vs batch) ---")
+    for n in (1_000, 10_000):
+        seq, batch = run(n), run_batch(n)
+        print(f"N={n:>6}  sequential={seq / n * 1e6:6.2f} us/sig  batch={batch / n * 1e6:6.2f} us/sig")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import sys
+import os
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from settlement.models import CompactSignal, OutcomeSignal
+from settlement.loader import (
+    write_binary, write_ndjson, iter_binary_records, iter_binary, iter_ndjson, ingest_stream,
+)
+
+# Usage: python benchmarks/bench_loader.py [signals]
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+
+def synthetic(n: int):
+    for i in range(n):
+        yield OutcomeSignal(
+            case_id=f"case_{i // 8}", source=f"oracle_{i % 8}", outcome="YES" if i % 5 else "NO",
+            received_at=1_700_000_000.0 + i,
+        )
+
+
+def timed(label: str, fn) -> None:
+    t0 = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - t0
+    print(f"{label:<36} {count / elapsed:12.0f} signals/sec")
+
+
+def main():
+    print(f"\n--- bench_loader ({N} signals) ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        bin_path = os.path.join(tmp, "signals.bin")
+        ndjson_path = os.path.join(tmp, "signals.ndjson")
+        write_binary(bin_path, synthetic(N))
+        write_ndjson(ndjson_path, synthetic(N))
+        print(f"file size: binary {os.path.getsize(bin_path) / N:5.1f} B/signal, "
+              f"ndjson {os.path.getsize(ndjson_path) / N:5.1f} B/signal")
+
+        timed("binary: raw records", lambda: sum(1 for _ in iter_binary_records(bin_path)))
+        timed("binary: CompactSignal", lambda: sum(1 for _ in iter_binary(bin_path, CompactSignal)))
+        timed("binary: OutcomeSignal", lambda: sum(1 for _ in iter_binary(bin_path)))
+        timed("ndjson: OutcomeSignal", lambda: sum(1 for _ in iter_ndjson(ndjson_path)))
+        timed("binary -> ingest_stream", lambda: sum(
+            len(c.signals) for c in ingest_stream(iter_binary(bin_path, CompactSignal)).cases.values()))
+
+
+if __name__ == "__main__":
+    main()
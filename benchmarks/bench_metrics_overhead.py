@@ -0,0 +1,115 @@
+import sys
+import os
+import statistics
+import time
+import timeit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from settlement import metrics
+from settlement.gate import settle_many
+from settlement.models import Case, CaseState, OutcomeSignal
+from settlement.reconciliation import MajorityPolicy, auto_reconcile, ingest_signal
+
+# Usage: python benchmarks/bench_metrics_overhead.py [signals] [rounds]
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+ROUNDS = int(sys.argv[2]) if len(sys.argv) > 2 else 11
+
+# The statements every instrumented function runs while metrics are off.
+DISABLED_CHECK = "t0 = metrics.perf_counter_ns() if metrics.enabled else 0\nif t0: pass"
+
+
+def make_signals():
+    return [
+        OutcomeSignal(case_id=f"case_{i // 4}", source=f"oracle_{i % 4}", outcome="YES" if i % 7 else "NO")
+        for i in range(N)
+    ]
+
+
+def time_ingest(signals) -> float:
+    cases = {}
+    t0 = time.perf_counter()
+    for s in signals:
+        case = cases.get(s.case_id)
+        if case is None:
+            case = cases[s.case_id] = Case(case_id=s.case_id)
+        ingest_signal(case, s)
+    return (time.perf_counter() - t0) / len(signals) * 1e9
+
+
+def time_bulk(signals) -> float:
+    """auto_reconcile + settle_many (and the set_state_many calls inside them); ns per case."""
+    cases = {}
+    for s in signals:
+        case = cases.get(s.case_id)
+        if case is None:
+            case = cases[s.case_id] = Case(case_id=s.case_id)
+        ingest_signal(case, s)
+    states = (CaseState.RESOLVED_PROVISIONAL, CaseState.IN_RECONCILIATION)
+    t0 = time.perf_counter()
+    auto_reconcile(cases.values(), MajorityPolicy(), states=states)
+    settle_many(cases.values())
+    return (time.perf_counter() - t0) / len(cases) * 1e9
+
+
+def interleaved(fn):
+    """
+    Runs fn with metrics off and on in alternating order, ROUNDS times each,
+    on the same fresh input per round. Returns (off samples, on samples).
+    """
+    off, on = [], []
+    for i in range(ROUNDS):
+        for enabled in ((False, True) if i % 2 == 0 else (True, False)):
+            signals = make_signals()
+            if enabled:
+                metrics.enable()
+            else:
+                metrics.disable()
+            (on if enabled else off).append(fn(signals))
+    metrics.disable()
+    return off, on
+
+
+def spread(samples) -> str:
+    q = statistics.quantiles(samples, n=4)
+    return f"median {statistics.median(samples):8.1f}  IQR {q[0]:8.1f} - {q[2]:8.1f}"
+
+
+def overhead(off, on) -> str:
+    # Per-round ratios: both runs of a round see the same machine state.
+    ratios = [b / a - 1 for a, b in zip(off, on)]
+    q = statistics.quantiles(ratios, n=4)
+    return f"{statistics.median(ratios) * 100:+6.1f}%  (IQR {q[0] * 100:+.1f}% .. {q[2] * 100:+.1f}%)"
+
+
+def main():
+    print(f"\n--- bench_metrics_overhead ({N} signals, {ROUNDS} interleaved rounds) ---")
+    metrics.reset()
+    off, on = interleaved(time_ingest)
+    print(f"ingest_signal metrics off  {spread(off)} ns/signal")
+    print(f"ingest_signal metrics on   {spread(on)} ns/signal")
+    print(f"ingest_signal on vs off    {overhead(off, on)}")
+
+    bulk_off, bulk_on = interleaved(time_bulk)
+    print(f"reconcile + settle off     {spread(bulk_off)} ns/case")
+    print(f"reconcile + settle on      {spread(bulk_on)} ns/case")
+    print(f"reconcile + settle on/off  {overhead(bulk_off, bulk_on)}")
+
+    # Cost of the disabled path itself (DISABLED_CHECK), timed in isolation and
+    # net of timeit's loop: too small to resolve from the end-to-end runs above.
+    loops = 1_000_000
+    check = min(timeit.repeat(DISABLED_CHECK, globals={"metrics": metrics}, number=loops, repeat=5))
+    empty = min(timeit.repeat("pass", number=loops, repeat=5))
+    check = (check - empty) / loops * 1e9
+    print(f"disabled check             {check:8.1f} ns/call  "
+          f"({check / statistics.median(off) * 100:.2f}% of median ingest_signal with metrics off)")
+
+    snap = metrics.snapshot()
+    for stage in ("ingest_signal", "auto_reconcile", "settle_many", "set_state_many"):
+        print(f"{stage} latency:", snap["latency"].get(stage))
+    bulk = ("auto_reconcile.", "settle_many.", "set_state_many.")
+    print("counters:", {k: v for k, v in snap["counters"].items() if k.startswith(bulk)})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import sys
+import os
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from settlement.ai_oracle import AIGeneratorConfig, BulkGeneratorConfig, generate_ai_signals, generate_bulk_signals, iter_bulk_batches
+
+# Usage: python benchmarks/bench_oracle_bulk.py [cases]
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+
+def main():
+    print(f"\n--- bench_oracle_bulk ({N} cases x 3 agents) ---")
+
+    t0 = time.perf_counter()
+    n = 0
+    for i in range(N):
+        n += len(generate_ai_signals(f"case_{i}", "Will Team A win?", AIGeneratorConfig(seed=i)))
+    elapsed = time.perf_counter() - t0
+    print(f"generate_ai_signals per case: {n / elapsed:12.0f} signals/sec")
+
+    cfg = BulkGeneratorConfig(n_cases=N, duplicate_rate=0.01, late_rate=0.01, arrival_skew=0.25)
+    t0 = time.perf_counter()
+    n = sum(len(b) for b in iter_bulk_batches(cfg))
+    elapsed = time.perf_counter() - t0
+    print(f"iter_bulk_batches (columns):  {n / elapsed:12.0f} signals/sec")
+
+    t0 = time.perf_counter()
+    n = sum(1 for _ in generate_bulk_signals(cfg))
+    elapsed = time.perf_counter() - t0
+    print(f"generate_bulk_signals:        {n / elapsed:12.0f} signals/sec")
+
+
+if __name__ == "__main__":
+    main()
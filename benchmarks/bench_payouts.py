@@ -0,0 +1,60 @@
+import sys
+import os
+import random
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from settlement.models import Case, CaseState
+from settlement.gate import attempt_settlement
+from settlement.payouts import PayoutLedger, StakeBook, write_receipts
+
+# Usage: python benchmarks/bench_payouts.py [stakes]
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+
+def main():
+    print(f"\n--- bench_payouts ({N} stakes on one case) ---")
+    rng = random.Random(1337)
+    accounts = [f"user_{i}" for i in range(N)]
+    sides = [rng.choice(("YES", "NO")) for _ in range(N)]
+    amounts = [rng.randint(100, 1_000_000) for _ in range(N)]
+
+    case = Case(case_id="pmkt_case", state=CaseState.FINAL, final_outcome="YES")
+    attempt_settlement(case)
+
+    # Baseline: the per-user float loop the demo used to do.
+    t0 = time.perf_counter()
+    pot = sum(amounts)
+    winners = {u: a for u, s, a in zip(accounts, sides, amounts) if s == "YES"}
+    total = sum(winners.values())
+    payout = {u: pot * a / total for u, a in winners.items()}
+    print(f"dict + float loop:   {(time.perf_counter() - t0) * 1e3:8.1f} ms  ({len(payout)} payouts)")
+
+    t0 = time.perf_counter()
+    book = StakeBook(case.case_id)
+    book.extend(accounts, sides, amounts)
+    print(f"StakeBook.extend:    {(time.perf_counter() - t0) * 1e3:8.1f} ms")
+
+    for mode, fee in (("pari_mutuel", 0), ("pari_mutuel", 250)):
+        ledger = PayoutLedger(mode=mode, fee_bps=fee)
+        t0 = time.perf_counter()
+        result = ledger.pay(case, book)
+        elapsed = time.perf_counter() - t0
+        assert result.paid == result.pool - result.fee
+        print(f"{mode} fee={fee:<4} {elapsed * 1e3:8.1f} ms  (exact: paid == pool - fee)")
+
+    t0 = time.perf_counter()
+    ledger.pay(case, book)
+    print(f"repeat pay():        {(time.perf_counter() - t0) * 1e6:8.1f} us  (idempotent per settlement_id)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        n = write_receipts(os.path.join(tmp, "receipts.ndjson"), result, book)
+        elapsed = time.perf_counter() - t0
+        print(f"write_receipts:      {elapsed * 1e3:8.1f} ms  ({n / elapsed:10.0f} lines/sec)")
+
+
+if __name__ == "__main__":
+    main()
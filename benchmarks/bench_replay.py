@@ -0,0 +1,61 @@
+import sys
+import os
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from settlement.ai_oracle import BulkGeneratorConfig, generate_bulk_signals
+from settlement.models import Case, CaseState
+from settlement.reconciliation import ingest_signal, majority_outcome, resolve_reconciliation
+from settlement.gate import attempt_settlement
+from settlement.ids import ContentIds
+from settlement.replay import replay
+from settlement.store import EventLogStore
+
+# Usage: python benchmarks/bench_replay.py [n_cases] [workers]
+N_CASES = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+WORKERS = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+AGENTS = 4
+
+
+def record(directory: str) -> int:
+    """Journals an interleaved day-like history: ingest, then resolve and settle every case."""
+    store = EventLogStore(directory, durability="none")
+    ids = ContentIds()
+    cfg = BulkGeneratorConfig(seed=7, n_cases=N_CASES, agents_per_case=AGENTS, arrival_skew=5.0,
+                              duplicate_rate=0.01, late_rate=0.02)
+    n = 0
+    for sig in generate_bulk_signals(cfg):
+        case = store.get_case(sig.case_id)
+        if case is None:
+            case = Case(case_id=sig.case_id)
+            store.put_case(case)
+        ingest_signal(case, sig)
+        n += 1
+    for case in store.cases.values():
+        if case.state in (CaseState.RESOLVED_PROVISIONAL, CaseState.IN_RECONCILIATION):
+            resolve_reconciliation(case, chosen_outcome=majority_outcome(case) or min(case.outcome_counts))
+            attempt_settlement(case, ids)
+    store.close()
+    return n
+
+
+def main():
+    print(f"\n--- bench_replay ({N_CASES} cases x {AGENTS} agents) ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        n = record(tmp)
+        size = sum(os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp))
+        print(f"recorded {n} signals ({size / 1e6:.1f} MB log) in {time.perf_counter() - t0:.2f} s")
+
+        for workers in sorted({1, WORKERS}):
+            report = replay([tmp], workers=workers)
+            rate = report.signals / report.seconds
+            print(f"workers={workers:<3} {report.seconds:7.2f} s  {rate:10.0f} signals/sec  "
+                  f"ok={report.ok} settled={report.settled}  "
+                  f"(20M signals: ~{20_000_000 / rate / 60:.1f} min)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import sys
+import os
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from settlement.models import Case, CaseState
+from settlement.gate import attempt_settlement, settle_many
+from settlement.ids import ContentIds, MonotonicIds, RandomIds
+
+# Usage: python benchmarks/bench_settle_many.py [cases]
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+
+def final_cases():
+    return [Case(case_id=f"case_{i}", state=CaseState.FINAL, final_outcome="YES") for i in range(N)]
+
+
+def main():
+    print(f"\n--- bench_settle_many ({N} FINAL cases at market close) ---")
+
+    cases = final_cases()
+    t0 = time.perf_counter()
+    for case in cases:
+        attempt_settlement(case)
+    loop = time.perf_counter() - t0
+    print(f"attempt_settlement loop: {loop * 1e3:8.1f} ms  ({N / loop:10.0f} cases/sec)")
+
+    cases = final_cases()
+    t0 = time.perf_counter()
+    batch = settle_many(cases)
+    bulk = time.perf_counter() - t0
+    assert len(batch) == N and all(s == "settled" for s in batch.status)
+    print(f"settle_many:             {bulk * 1e3:8.1f} ms  ({N / bulk:10.0f} cases/sec)")
+
+    t0 = time.perf_counter()
+    retry = settle_many(cases)
+    assert retry.settlement_ids == batch.settlement_ids
+    print(f"settle_many retry:       {(time.perf_counter() - t0) * 1e3:8.1f} ms  (idempotent)")
+
+    print("\nsettlement id generators (settle_many):")
+    for ids in (RandomIds(), ContentIds(namespace="bench"), MonotonicIds()):
+        cases = final_cases()
+        t0 = time.perf_counter()
+        settle_many(cases, ids=ids)
+        elapsed = time.perf_counter() - t0
+        print(f"  {type(ids).__name__:<14} {N / elapsed:10.0f} cases/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import sys
+import os
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from settlement.models import OutcomeSignal
+from settlement.sharding import ShardedEngine
+
+# Usage: python benchmarks/bench_sharded_engine.py [cases] [max_shards]
+CASES = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+MAX_SHARDS = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+
+
+def run(shards: int, signals, case_ids) -> float:
+    with ShardedEngine(shards=shards) as engine:
+        t0 = time.perf_counter()
+        engine.ingest(signals)
+        engine.resolve((case_id, "YES") for case_id in case_ids)
+        settled = engine.settle(case_ids)
+        elapsed = time.perf_counter() - t0
+        assert all(sid for sid, _ in settled)
+        assert engine.case_count() == len(case_ids)
+    return elapsed
+
+
+def main():
+    print(f"\n--- bench_sharded_engine ({CASES} cases x 3 signals, up to {MAX_SHARDS} shards) ---")
+    case_ids = [f"case_{i}" for i in range(CASES)]
+    signals = [
+        OutcomeSignal(case_id=case_id, source=source, outcome="YES")
+        for case_id in case_ids
+        for source in ("oracle_A", "oracle_B", "oracle_C")
+    ]
+    ops = len(signals) + 2 * len(case_ids)
+
+    shards, base = 1, None
+    while shards <= MAX_SHARDS:
+        elapsed = run(shards, signals, case_ids)
+        rate = ops / elapsed
+        base = base or rate
+        print(f"shards={shards:>2}  {rate:10.0f} ops/sec  speedup={rate / base:4.2f}x")
+        shards *= 2
+
+
+if __name__ == "__main__":
+    main()
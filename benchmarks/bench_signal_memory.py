@@ -0,0 +1,35 @@
+import sys
+import os
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from settlement.models import Case, CompactSignal, OutcomeSignal, SignalColumns
+from settlement.reconciliation import ingest_signal
+
+# Usage: python benchmarks/bench_signal_memory.py [signals]
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+
+def measure(label: str, signal_cls, signals_factory) -> None:
+    tracemalloc.start()
+    case = Case(case_id="mem_case", signals=signals_factory())
+    for i in range(N):
+        # Fresh (non-interned) strings per signal, as decoded from a feed would be.
+        source = "ai_agent_" + str(i % 16)
+        outcome = "YES" if i % 3 else "NO"
+        ingest_signal(case, signal_cls(case_id=case.case_id, source=source, outcome=outcome))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<32} {current / N:7.1f} bytes/signal")
+
+
+def main():
+    print(f"\n--- bench_signal_memory ({N} signals in one case, incl. case indexes) ---")
+    measure("OutcomeSignal in dict", OutcomeSignal, dict)
+    measure("CompactSignal in dict", CompactSignal, dict)
+    measure("OutcomeSignal in SignalColumns", OutcomeSignal, SignalColumns)
+
+
+if __name__ == "__main__":
+    main()
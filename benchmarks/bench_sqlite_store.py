@@ -0,0 +1,54 @@
+import sys
+import os
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from settlement.models import Case, OutcomeSignal
+from settlement.reconciliation import ingest_signals
+from settlement.store import SQLiteStore
+
+# Usage: python benchmarks/bench_sqlite_store.py [total_signal_rows] [signals_per_case] [group_commit]
+TOTAL_ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+SIGNALS_PER_CASE = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+GROUP_COMMIT = int(sys.argv[3]) if len(sys.argv) > 3 else 1_000
+
+
+def main():
+    n_cases = TOTAL_ROWS // SIGNALS_PER_CASE
+    print(f"\n--- bench_sqlite_store ({n_cases} cases x {SIGNALS_PER_CASE} signals, group_commit={GROUP_COMMIT}) ---")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteStore(os.path.join(tmp, "bench.db"), group_commit=GROUP_COMMIT)
+
+        # Only time spent inside the store is measured; case construction is excluded.
+        write = 0.0
+        for i in range(n_cases):
+            case = Case(case_id=f"case_{i}")
+            ingest_signals(
+                case,
+                (OutcomeSignal(case_id=case.case_id, source=f"oracle_{j}", outcome="YES")
+                 for j in range(SIGNALS_PER_CASE)),
+            )
+            t0 = time.perf_counter()
+            store.put_case(case)
+            write += time.perf_counter() - t0
+        t0 = time.perf_counter()
+        store.flush()
+        write += time.perf_counter() - t0
+        print(f"write: {n_cases / write:10.0f} cases/sec  {n_cases * SIGNALS_PER_CASE / write:10.0f} signals/sec")
+
+        step = max(1, n_cases // 10_000)
+        ids = [f"case_{i}" for i in range(0, n_cases, step)]
+        t0 = time.perf_counter()
+        for case_id in ids:
+            store.get_case(case_id)
+        read = time.perf_counter() - t0
+        print(f"read:  {len(ids) / read:10.0f} cases/sec  {len(ids) * SIGNALS_PER_CASE / read:10.0f} signals/sec")
+
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
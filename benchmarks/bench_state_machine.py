@@ -0,0 +1,61 @@
+import sys
+import os
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from settlement.models import Case, CaseState
+from settlement.state_machine import set_state, set_state_many, InvalidTransition
+
+# Usage: python benchmarks/bench_state_machine.py [cases]
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+
+def legacy_set_state(case: Case, new_state: CaseState) -> None:
+    # The original implementation: rebuilds the table on every call.
+    allowed = {
+        CaseState.OPEN: {CaseState.RESOLVED_PROVISIONAL, CaseState.IN_RECONCILIATION},
+        CaseState.RESOLVED_PROVISIONAL: {CaseState.IN_RECONCILIATION, CaseState.FINAL},
+        CaseState.IN_RECONCILIATION: {CaseState.FINAL},
+        CaseState.FINAL: {CaseState.SETTLED},
+        CaseState.SETTLED: set(),
+    }
+    if new_state not in allowed[case.state]:
+        raise InvalidTransition(f"{case.state} -> {new_state} not allowed")
+    case.state = new_state
+
+
+def provisional_cases():
+    return [Case(case_id=f"case_{i}", state=CaseState.RESOLVED_PROVISIONAL) for i in range(N)]
+
+
+def timed(label: str, fn) -> None:
+    cases = provisional_cases()
+    t0 = time.perf_counter()
+    fn(cases)
+    elapsed = time.perf_counter() - t0
+    assert all(c.state == CaseState.FINAL for c in cases)
+    print(f"{label:<28} {elapsed / N * 1e9:8.1f} ns/transition")
+
+
+def main():
+    print(f"\n--- bench_state_machine (RESOLVED_PROVISIONAL -> FINAL for {N} cases) ---")
+
+    def legacy(cases):
+        for c in cases:
+            legacy_set_state(c, CaseState.FINAL)
+
+    def per_case(cases):
+        for c in cases:
+            set_state(c, CaseState.FINAL)
+
+    def bulk(cases):
+        set_state_many(cases, CaseState.FINAL)
+
+    timed("legacy (table per call)", legacy)
+    timed("set_state (bitmask)", per_case)
+    timed("set_state_many", bulk)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import sys
+import os
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from settlement.models import Case
+from settlement.reconciliation import ingest_signal, resolve_reconciliation
+from settlement.gate import attempt_settlement
+from settlement.store import InMemoryStore, SQLiteStore, TieredStore
+from settlement.ai_oracle import BulkGeneratorConfig, generate_bulk_signals
+
+# Usage: python benchmarks/bench_tiered_store.py [cases]
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+
+def drive(store) -> float:
+    """Streams signals in arrival order; each case settles once all its agents report."""
+    cfg = BulkGeneratorConfig(n_cases=N, agents_per_case=3, conflict_rate=0.2, arrival_skew=0.5)
+    t0 = time.perf_counter()
+    for sig in generate_bulk_signals(cfg):
+        case = store.get_case(sig.case_id)
+        if case is None:
+            case = Case(case_id=sig.case_id)
+            store.put_case(case)
+        ingest_signal(case, sig)
+        if len(case.signals) == cfg.agents_per_case:
+            resolve_reconciliation(case, chosen_outcome=min(case.outcome_counts))
+            attempt_settlement(case)
+    return time.perf_counter() - t0
+
+
+def main():
+    print(f"\n--- bench_tiered_store ({N} cases, settled as they complete) ---")
+
+    tracemalloc.start()
+    store = InMemoryStore()
+    elapsed = drive(store)
+    resident = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"InMemoryStore:             {elapsed:6.2f} s  resident={resident / 1e6:6.1f} MB  cases={len(store.cases)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tracemalloc.start()
+        store = TieredStore(SQLiteStore(os.path.join(tmp, "cold.db"), group_commit=1 << 30, synchronous="NORMAL"),
+                            max_hot=10_000, write_batch=1024)
+        elapsed = drive(store)
+        resident = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        s = store.stats
+        print(f"TieredStore(SQLiteStore):  {elapsed:6.2f} s  resident={resident / 1e6:6.1f} MB  cases={store.resident_cases}")
+        print(f"  hits={s.hits} misses={s.misses} evictions={s.evictions} paged_out={s.paged_out} "
+              f"writebacks={s.writebacks} in {s.write_batches} batches")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
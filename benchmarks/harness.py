@@ -0,0 +1,315 @@
+import sys
+import os
+import argparse
+import json
+import multiprocessing as mp
+import platform
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from settlement.ai_oracle import AIGeneratorConfig, generate_ai_signals
+from settlement.models import Case, CaseState
+from settlement.reconciliation import MajorityPolicy, auto_reconcile, ingest_signal, resolve_reconciliation
+from settlement.gate import attempt_settlement, settle_many
+from settlement.settlement_requests import SettlementRequestRegistry
+from settlement.store import EventLogStore, SQLiteStore
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Reproducible benchmark harness.
+#
+#   python benchmarks/harness.py                        run every scenario
+#   python benchmarks/harness.py --quick                1/10 scale (CI smoke run)
+#   python benchmarks/harness.py --only conflict_sweep  one scenario
+#   python benchmarks/harness.py --save base.json       save results as a baseline
+#   python benchmarks/harness.py --compare base.json    flag regressions vs a baseline
+#
+# CI prints a --quick run against benchmarks/baseline_quick.json with
+# --report-only: the baseline holds absolute numbers from another machine
+# and quick runs vary by tens of percent, so the comparison is for reading,
+# not a gate. Check regressions with --compare on one machine, against a
+# baseline saved there. Refresh the committed baseline with --quick --save
+# when a change is expected to move the numbers.
+#
+# Workloads are built with generate_ai_signals under fixed seeds, so every
+# run replays the same cases, outcomes and conflicts. Each scenario runs in
+# its own process, so its peak RSS is not inflated by earlier scenarios.
+
+SEED = 1337
+PROMPTS = (
+    "Will Team A win the final?",
+    "Does the incumbent lose the runoff?",
+    "Will the launch happen before Friday?",
+)
+
+
+def workload(n_cases, n_agents, conflict_rate, seed=SEED, prefix="case"):
+    """Returns [(case_id, signals)] for n_cases, deterministic under seed."""
+    out = []
+    for i in range(n_cases):
+        case_id = f"{prefix}_{i:07d}"
+        cfg = AIGeneratorConfig(seed=seed + i, n_agents=n_agents, conflict_rate=conflict_rate)
+        out.append((case_id, generate_ai_signals(case_id, PROMPTS[i % len(PROMPTS)], cfg)))
+    return out
+
+
+def percentile(sorted_ns, q):
+    if not sorted_ns:
+        return None
+    return sorted_ns[min(len(sorted_ns) - 1, int(q * len(sorted_ns)))]
+
+
+def result(name, ops, seconds, latencies_ns=None, **extra):
+    """One row of output. Latencies are per-op wall times in nanoseconds."""
+    row = {"name": name, "ops": ops, "seconds": seconds, "ops_per_sec": ops / seconds if ops and seconds else None,
+           "p50_us": None, "p99_us": None}
+    if latencies_ns:
+        latencies_ns.sort()
+        row["p50_us"] = percentile(latencies_ns, 0.50) / 1e3
+        row["p99_us"] = percentile(latencies_ns, 0.99) / 1e3
+    row.update(extra)
+    return row
+
+
+def timed(fn, items):
+    """Calls fn(item) for every item; returns (elapsed seconds, per-call ns)."""
+    clock = time.perf_counter_ns
+    lat = []
+    append = lat.append
+    start = clock()
+    for item in items:
+        t0 = clock()
+        fn(item)
+        append(clock() - t0)
+    return (clock() - start) / 1e9, lat
+
+
+def ingest_all(cases_by_id, work):
+    signals = [(cases_by_id[case_id], s) for case_id, sigs in work for s in sigs]
+    return timed(lambda cs: ingest_signal(cs[0], cs[1]), signals)
+
+
+def to_final(cases):
+    auto_reconcile(cases, MajorityPolicy(min_share=0.0), states=(CaseState.RESOLVED_PROVISIONAL,))
+    for case in cases:
+        if case.state == CaseState.IN_RECONCILIATION:
+            resolve_reconciliation(case, chosen_outcome=min(case.outcome_counts))
+
+
+# --- Scenarios --------------------------------------------------------------
+
+
+def scenario_signals_per_case(scale):
+    rows = []
+    total = int(100_000 * scale)
+    for n_agents in (4, 16, 64, 256):
+        work = workload(max(1, total // n_agents), n_agents, 0.35)
+        cases = {case_id: Case(case_id=case_id) for case_id, _ in work}
+        seconds, lat = ingest_all(cases, work)
+        rows.append(result(f"ingest.agents={n_agents}", len(lat), seconds, lat))
+    return rows
+
+
+def scenario_conflict_sweep(scale):
+    rows = []
+    n = int(50_000 * scale)
+    for rate in (0.0, 0.1, 0.35, 0.5):
+        work = workload(n, 5, rate)
+        cases = {case_id: Case(case_id=case_id) for case_id, _ in work}
+        seconds, lat = ingest_all(cases, work)
+        conflicted = sum(c.state == CaseState.IN_RECONCILIATION for c in cases.values())
+        rows.append(result(f"ingest.conflict={rate}", len(lat), seconds, lat, conflicted=conflicted))
+
+        t0 = time.perf_counter()
+        finalized = auto_reconcile(list(cases.values()), MajorityPolicy())
+        rows.append(result(f"auto_reconcile.conflict={rate}", conflicted, time.perf_counter() - t0,
+                           finalized=len(finalized)))
+    return rows
+
+
+def scenario_mass_settlement(scale):
+    rows = []
+    n = int(100_000 * scale)
+    work = workload(n, 3, 0.1)
+    for mode in ("attempt_settlement", "settle_many"):
+        cases = [Case(case_id=case_id) for case_id, _ in work]
+        by_id = {c.case_id: c for c in cases}
+        ingest_all(by_id, work)
+        to_final(cases)
+        if mode == "attempt_settlement":
+            seconds, lat = timed(attempt_settlement, cases)
+            rows.append(result("settle.attempt_settlement", n, seconds, lat))
+        else:
+            t0 = time.perf_counter()
+            batch = settle_many(cases)
+            rows.append(result("settle.settle_many", len(batch), time.perf_counter() - t0))
+    return rows
+
+
+def scenario_registry_replay(scale):
+    """Every case gets several request ids, each retried several times, interleaved."""
+    rows = []
+    n = int(20_000 * scale)
+    work = workload(n, 3, 0.0)
+    cases = [Case(case_id=case_id) for case_id, _ in work]
+    ingest_all({c.case_id: c for c in cases}, work)
+    to_final(cases)
+
+    requests = [(case, f"req_{case.case_id}_{r}") for _ in range(4) for r in range(3) for case in cases]
+    registry = SettlementRequestRegistry()
+    seconds, lat = timed(lambda cr: registry.submit(cr[0], cr[1]), requests)
+    rows.append(result("registry.replay_storm", len(requests), seconds, lat,
+                       settled=sum(c.state == CaseState.SETTLED for c in cases)))
+    return rows
+
+
+def scenario_store_persistence(scale):
+    rows = []
+    n = int(20_000 * scale)
+    work = workload(n, 3, 0.2)
+    with tempfile.TemporaryDirectory() as tmp:
+        stores = (
+            ("sqlite", lambda: SQLiteStore(os.path.join(tmp, "bench.db"), group_commit=256, synchronous="NORMAL")),
+            ("event_log", lambda: EventLogStore(os.path.join(tmp, "log"), durability="flush")),
+        )
+        for name, open_store in stores:
+            store = open_store()
+            cases = [Case(case_id=case_id) for case_id, _ in work]
+
+            def persist(i):
+                case = cases[i]
+                for s in work[i][1]:
+                    ingest_signal(case, s)
+                store.put_case(case)
+
+            seconds, lat = timed(persist, range(n))
+            store.close()
+            rows.append(result(f"store.{name}.write", n, seconds, lat))
+
+            t0 = time.perf_counter()
+            reopened = open_store()
+            for case_id, _ in work[:1000]:
+                assert reopened.get_case(case_id) is not None
+            reopened.close()
+            rows.append(result(f"store.{name}.reopen", n, time.perf_counter() - t0))
+    return rows
+
+
+SCENARIOS = {
+    "signals_per_case": scenario_signals_per_case,
+    "conflict_sweep": scenario_conflict_sweep,
+    "mass_settlement": scenario_mass_settlement,
+    "registry_replay": scenario_registry_replay,
+    "store_persistence": scenario_store_persistence,
+}
+
+
+# --- Runner -----------------------------------------------------------------
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024  # bytes vs KiB
+
+
+def _child(name, scale, conn):
+    rows = SCENARIOS[name](scale)
+    conn.send((rows, peak_rss_mb()))
+    conn.close()
+
+
+def run_scenario(name, scale):
+    parent, child = mp.Pipe(duplex=False)
+    proc = mp.get_context("spawn").Process(target=_child, args=(name, scale, child))
+    proc.start()
+    child.close()
+    rows, rss = parent.recv()
+    proc.join()
+    for row in rows:
+        row["scenario"] = name
+        row["peak_rss_mb"] = rss
+    return rows
+
+
+def fmt(value, spec):
+    return format(value, spec) if value is not None else "-".rjust(len(format(0, spec)))
+
+
+def compare(rows, baseline, threshold):
+    """Returns regression messages: throughput down or p99 up by more than threshold."""
+    base = {r["name"]: r for r in baseline["results"]}
+    problems = []
+    print(f"\n--- vs baseline ({baseline.get('created', '?')}, threshold {threshold:.0%}) ---")
+    for row in rows:
+        old = base.get(row["name"])
+        if old is None:
+            continue
+        notes = []
+        if row["ops_per_sec"] and old.get("ops_per_sec"):
+            change = row["ops_per_sec"] / old["ops_per_sec"] - 1
+            notes.append(f"ops/sec {change:+7.1%}")
+            if change < -threshold:
+                problems.append(f"{row['name']}: ops/sec {change:+.1%}")
+        if row["p99_us"] and old.get("p99_us"):
+            change = row["p99_us"] / old["p99_us"] - 1
+            notes.append(f"p99 {change:+7.1%}")
+            if change > threshold:
+                problems.append(f"{row['name']}: p99 {change:+.1%}")
+        print(f"{row['name']:<32} {'  '.join(notes)}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seeded throughput / latency / memory benchmarks.")
+    parser.add_argument("--only", action="append", choices=sorted(SCENARIOS), help="run only these scenarios")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier on workload sizes")
+    parser.add_argument("--quick", action="store_true", help="same as --scale 0.1")
+    parser.add_argument("--save", metavar="PATH", help="write results as JSON (a baseline for --compare)")
+    parser.add_argument("--compare", metavar="PATH", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="regression threshold (default 0.15)")
+    parser.add_argument("--report-only", action="store_true", help="print regressions but exit 0")
+    args = parser.parse_args()
+    scale = 0.1 if args.quick else args.scale
+
+    rows = []
+    print(f"{'benchmark':<32} {'ops':>9} {'ops/sec':>12} {'p50 us':>9} {'p99 us':>9} {'peak MB':>8}")
+    for name in args.only or SCENARIOS:
+        for row in run_scenario(name, scale):
+            rows.append(row)
+            print(f"{row['name']:<32} {row['ops']:>9} {fmt(row['ops_per_sec'], '12.0f')} "
+                  f"{fmt(row['p50_us'], '9.2f')} {fmt(row['p99_us'], '9.2f')} {fmt(row['peak_rss_mb'], '8.1f')}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "scale": scale,
+                "python": platform.python_version(),
+                "machine": platform.platform(),
+                "results": rows,
+            }, f, indent=2)
+        print(f"\nsaved {len(rows)} results to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("scale") != scale:
+            print(f"\nwarning: baseline scale {baseline.get('scale')} != {scale}; numbers are not comparable")
+        problems = compare(rows, baseline, args.threshold)
+        if problems:
+            print("\nREGRESSIONS:\n  " + "\n  ".join(problems))
+            if not args.report_only:
+                sys.exit(1)
+            return
+        print("\nno regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import sys
+import os
+import multiprocessing as mp
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from settlement.models import Case, CaseState
+from settlement.settlement_requests import SettlementRequestRegistry, SQLiteRequestBackend
+
+# Usage: python benchmarks/stress_registry_multiprocess.py [processes] [cases] [requests_per_case]
+PROCESSES = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+CASES = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+REQUESTS_PER_CASE = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+
+
+def worker(db_path: str, worker_id: int, out: "mp.Queue") -> None:
+    registry = SettlementRequestRegistry(backend=SQLiteRequestBackend(db_path))
+    # Every worker holds its own copy of every FINAL case, as separate
+    # settlement workers would after loading them from a store.
+    cases = [Case(case_id=f"case_{i}", state=CaseState.FINAL, final_outcome="YES") for i in range(CASES)]
+    by_request = {}
+    submitted = 0
+    for k in range(REQUESTS_PER_CASE):
+        # Rotate the start so workers race on different cases at the same time.
+        for j in range(CASES):
+            case = cases[(j + worker_id * 97) % CASES]
+            # Request ids are shared across workers (retries of the same intent).
+            request_id = f"{case.case_id}:req_{k}"
+            r = registry.submit(case, request_id)
+            assert r.ok, r
+            by_request[request_id] = r.settlement_id
+            submitted += 1
+    out.put((worker_id, submitted, {c.case_id: c.settlement_id for c in cases}, by_request))
+
+
+def main():
+    print(f"\n--- stress_registry_multiprocess ({PROCESSES} procs x {CASES} cases x {REQUESTS_PER_CASE} req ids) ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "requests.db")
+        SQLiteRequestBackend(db_path).close()  # create schema up front
+
+        out: "mp.Queue" = mp.Queue()
+        procs = [mp.Process(target=worker, args=(db_path, w, out)) for w in range(PROCESSES)]
+        t0 = time.perf_counter()
+        for p in procs:
+            p.start()
+        results = [out.get() for _ in procs]
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - t0
+
+    total = sum(r[1] for r in results)
+    case_ids = {}
+    request_ids = {}
+    for _, _, cases, requests in results:
+        for case_id, sid in cases.items():
+            # None: this worker only ever saw dedup hits for the case.
+            if sid is not None:
+                case_ids.setdefault(case_id, set()).add(sid)
+        for request_id, sid in requests.items():
+            request_ids.setdefault(request_id, set()).add(sid)
+            case_ids.setdefault(request_id.split(":")[0], set()).add(sid)
+
+    split_cases = [c for c, sids in case_ids.items() if len(sids) != 1]
+    split_requests = [r for r, sids in request_ids.items() if len(sids) != 1]
+    print(f"submissions: {total}  ({total / elapsed:10.0f} /sec across {PROCESSES} processes)")
+    print(f"cases with more than one settlement_id:      {len(split_cases)}")
+    print(f"request_ids with more than one settlement_id: {len(split_requests)}")
+    if split_cases or split_requests:
+        raise SystemExit("exactly-once violated")
+    print("exactly-once: OK")
+
+
+if __name__ == "__main__":
+    main()
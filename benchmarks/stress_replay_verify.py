@@ -0,0 +1,93 @@
+import sys
+import os
+import random
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from settlement.models import Case, CaseState, OutcomeSignal
+from settlement.reconciliation import ingest_signal, ingest_signals, resolve_reconciliation
+from settlement.gate import attempt_settlement
+from settlement.ids import ContentIds
+from settlement.replay import replay
+from settlement.store import EventLogStore, _encode, _EV_TRANSITION
+
+# Usage: python benchmarks/stress_replay_verify.py [cases] [steps] [seed]
+CASES = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+STEPS = int(sys.argv[2]) if len(sys.argv) > 2 else 6_000
+SEED = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+WORKERS = 3
+
+
+def record(directory: str) -> list:
+    """Random interleaved history: single and batched ingest, snapshots, non-ASCII ids."""
+    rng = random.Random(SEED)
+    ids = ContentIds()
+    store = EventLogStore(directory, snapshot_every=STEPS // 2, durability="none")
+    cases = []
+    for i in range(CASES):
+        case = Case(case_id=f"case_{i}" if i % 50 else f"casé_{i}")
+        store.put_case(case)
+        cases.append(case)
+    for step in range(STEPS):
+        case = rng.choice(cases)
+        r = rng.random()
+        if case.state not in (CaseState.FINAL, CaseState.SETTLED) or r < 0.3:
+            if r < 0.1:
+                ingest_signals(case, [
+                    OutcomeSignal(case.case_id, f"src_{rng.randrange(5)}", rng.choice("YN")) for _ in range(3)
+                ])
+            else:
+                meta = {"seq": step} if r < 0.2 else {}
+                ingest_signal(case, OutcomeSignal(case.case_id, f"src_{rng.randrange(5)}", rng.choice("YNY"), meta=meta))
+        if case.state in (CaseState.RESOLVED_PROVISIONAL, CaseState.IN_RECONCILIATION) and rng.random() < 0.1:
+            resolve_reconciliation(case, chosen_outcome=max(case.outcome_counts, key=case.outcome_counts.get))
+        elif case.state == CaseState.FINAL and rng.random() < 0.5:
+            attempt_settlement(case, ids)
+    store.close()
+    return cases
+
+
+def check(label: str, ok: bool) -> bool:
+    print(f"{'ok  ' if ok else 'FAIL'} {label}")
+    return ok
+
+
+def main():
+    print(f"\n--- stress_replay_verify ({CASES} cases, {STEPS} steps, seed {SEED}) ---")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = record(tmp)
+        settled = [c for c in cases if c.state == CaseState.SETTLED]
+
+        serial = replay([tmp], workers=1)
+        parallel = replay([tmp], workers=WORKERS)
+        results.append(check(f"serial replay clean ({serial.signals} signals, {serial.checks} checks)", serial.ok))
+        results.append(check(f"{WORKERS} workers agree with serial",
+                             parallel.ok and parallel.summary() | {"seconds": 0} == serial.summary() | {"seconds": 0}))
+        wrong = replay([tmp], workers=1, id_namespace="other")
+        results.append(check(f"wrong id namespace flags every settled case ({wrong.divergent_cases}/{len(settled)})",
+                             wrong.divergent_cases == len(settled)))
+        results.append(check("id_namespace=None skips id comparison", replay([tmp], workers=1, id_namespace=None).ok))
+
+        # Tamper: a transition claiming another outcome for a settled case, then a torn frame.
+        victim = settled[0]
+        log = os.path.join(tmp, sorted(n for n in os.listdir(tmp) if n.startswith("events."))[-1])
+        with open(log, "ab") as f:
+            f.write(_encode(_EV_TRANSITION, [victim.case_id, "SETTLED", "N" if victim.final_outcome == "Y" else "Y",
+                                             victim.settled_at, victim.settlement_id, None]))
+            f.write(b"\x10\x00\x00")
+        for workers in (1, WORKERS):
+            report = replay([tmp], workers=workers)
+            found = [d.case_id for d in report.divergences] == [victim.case_id]
+            found = found and report.divergences[0].attribute == "final_outcome"
+            results.append(check(f"tampered transition found, workers={workers}", found))
+            results.append(check(f"torn tail reported, workers={workers}", report.truncated == [log]))
+
+    if not all(results):
+        raise SystemExit("replay verification failed")
+    print("replay verification: OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import sys
+import os
+import asyncio
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from settlement.models import OutcomeSignal
+from settlement.pipeline import SettlementPipeline
+from settlement.reconciliation import majority_outcome
+
+
+async def majority_resolver(case):
+    # Simulates an I/O-bound arbiter call; waits until three signals are in.
+    await asyncio.sleep(0.001)
+    if len(case.signals) < 3:
+        return None
+    return majority_outcome(case)
+
+
+async def post_to_ledger(case, settlement_id):
+    await asyncio.sleep(0.001)
+
+
+async def main():
+    print("\n--- pipeline_demo ---")
+    pipeline = SettlementPipeline(resolver=majority_resolver, on_settled=post_to_ledger, concurrency=16)
+    await pipeline.start()
+
+    for i in range(1000):
+        case_id = f"pipe_case_{i}"
+        for source, outcome in (("oracle_A", "YES"), ("oracle_B", "NO" if i % 4 == 0 else "YES"), ("oracle_C", "YES")):
+            await pipeline.submit(OutcomeSignal(case_id=case_id, source=source, outcome=outcome))
+
+    await pipeline.close()
+    print("ingested:", pipeline.ingested, "finalized:", pipeline.finalized, "settled:", pipeline.settled)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
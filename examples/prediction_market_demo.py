@@ -9,6 +9,7 @@ from settlement.models import Case, OutcomeSignal
 from settlement.store import InMemoryStore
 from settlement.reconciliation import ingest_signal, resolve_reconciliation
 from settlement.gate import attempt_settlement, SettlementError
+from settlement.payouts import PayoutLedger, StakeBook
 
 
 def write_receipt(name: str, receipt: dict):
@@ -26,12 +27,14 @@ def run_prediction_market_demo():
     market_id = "pmkt_1"
     case_id = "pmkt_case_1"
 
-    # Participants place stakes (toy ledger)
+    # Participants place stakes (minor units, e.g. cents)
     stakes = {
-        "alice": {"side": "YES", "amount": 50},
-        "bob":   {"side": "NO",  "amount": 50},
+        "alice": {"side": "YES", "amount": 5_000},
+        "bob":   {"side": "NO",  "amount": 5_000},
     }
-    pot = sum(x["amount"] for x in stakes.values())
+    book = StakeBook(case_id)
+    for user, stake in stakes.items():
+        book.add(user, stake["side"], stake["amount"])
 
     store = InMemoryStore()
     case = Case(case_id=case_id)
@@ -57,20 +60,16 @@ def run_prediction_market_demo():
         print("settlement blocked:", e)
         return
 
-    # Payout ledger (toy): winners split pot
-    winners = [u for u, s in stakes.items() if s["side"] == case.final_outcome]
-    payout = {}
-    if winners:
-        share = pot / len(winners)
-        for u in winners:
-            payout[u] = share
+    # Pari-mutuel payout: winners split the pot exactly, once per settlement_id
+    result = PayoutLedger(mode="pari_mutuel").pay(case, book)
+    payout = {book.accounts[r]: amount for r, amount in zip(result.rows, result.amounts)}
 
     receipt = {
         "market_id": market_id,
         "case_id": case_id,
         "final_outcome": case.final_outcome,
         "settlement_id": settlement_id,
-        "pot": pot,
+        "pot": result.pool,
         "stakes": stakes,
         "payout": payout,
         "timestamp_utc": datetime.utcnow().isoformat() + "Z",
@@ -1,61 +1,21 @@
 import sys
 import os
 import json
-from datetime import datetime
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from settlement.models import Case, OutcomeSignal
 from settlement.store import InMemoryStore
 from settlement.reconciliation import ingest_signal, resolve_reconciliation
-from settlement.gate import attempt_settlement, SettlementError
+from settlement.gate import attempt_settlement, set_default_id_generator, SettlementError
+from settlement.ids import ContentIds
+from settlement.audit import case_trace
+from settlement.dedup import DedupIndex
 
 
 def write_trace(name: str, case):
-    """Write a deterministic trace artifact for repo visitors.
-
-    Robust to different signal storage formats (objects, dicts, strings).
-    """
-    def normalize_signal(s):
-        # If it's already a dict-like object
-        if isinstance(s, dict):
-            return {
-                "source": s.get("source"),
-                "outcome": s.get("outcome"),
-                "raw": s,
-            }
-
-        # If it's a simple string (common if signals are stored as "source:outcome" or similar)
-        if isinstance(s, str):
-            # Try to parse a couple common formats; otherwise store as raw string
-            if ":" in s:
-                left, right = s.split(":", 1)
-                return {"source": left.strip(), "outcome": right.strip(), "raw": s}
-            if "|" in s:
-                left, right = s.split("|", 1)
-                return {"source": left.strip(), "outcome": right.strip(), "raw": s}
-            return {"source": None, "outcome": None, "raw": s}
-
-        # If it's an object with attributes like OutcomeSignal
-        source = getattr(s, "source", None)
-        outcome = getattr(s, "outcome", None)
-        if source is not None or outcome is not None:
-            return {"source": source, "outcome": outcome, "raw": repr(s)}
-
-        # Fallback
-        return {"source": None, "outcome": None, "raw": repr(s)}
-
-    signals = getattr(case, "signals", [])
-    artifact = {
-        "scenario": name,
-        "case_id": getattr(case, "case_id", None),
-        "state": str(getattr(case, "state", None)),
-        "final_outcome": getattr(case, "final_outcome", None),
-        "signals": [normalize_signal(s) for s in (signals or [])],
-        "reconciliation_reason": getattr(case, "reconciliation_reason", None),
-        "settlement_id": getattr(case, "settlement_id", None),
-        "timestamp_utc": datetime.utcnow().isoformat() + "Z",
-    }
+    """Write a trace artifact for repo visitors (production code should use AuditSink)."""
+    artifact = case_trace(name, case)
 
     os.makedirs("examples/traces", exist_ok=True)
     path = os.path.join("examples", "traces", f"{name}_{artifact['case_id']}.json")
@@ -118,14 +78,16 @@ def scenario_duplicate_and_late():
     store = InMemoryStore()
     case = Case(case_id="case_3")
     store.put_case(case)
+    # Retries arrive with fresh signal_ids, so dedup on content instead
+    dedup = DedupIndex()
 
     # Initial signal arrives
-    ok, reason = ingest_signal(case, OutcomeSignal(case_id="case_3", source="oracle_A", outcome="YES"))
+    ok, reason = ingest_signal(case, OutcomeSignal(case_id="case_3", source="oracle_A", outcome="YES"), dedup=dedup)
     print("ingest initial:", ok, reason, "state:", case.state)
 
     # Duplicate retry of the same signal (common in real systems)
-    ok, reason = ingest_signal(case, OutcomeSignal(case_id="case_3", source="oracle_A", outcome="YES"))
-    print("ingest duplicate:", ok, reason, "state:", case.state)
+    ok, reason = ingest_signal(case, OutcomeSignal(case_id="case_3", source="oracle_A", outcome="YES"), dedup=dedup)
+    print("ingest duplicate:", ok, reason, "state:", case.state, "signals:", len(case.signals))
 
     # Finalize (no dispute)
     resolve_reconciliation(case, chosen_outcome="YES")
@@ -188,6 +150,8 @@ def scenario_three_oracles_majority():
 
 
 if __name__ == "__main__":
+    # Content-addressed ids, so the traces can be re-verified with settlement.replay
+    set_default_id_generator(ContentIds())
     scenario_clean()
     scenario_conflict()
     scenario_duplicate_and_late()
@@ -1,46 +1,21 @@
 ﻿import sys
 import os
 import json
-from datetime import datetime
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from settlement.models import Case
+from settlement.models import Case, CaseState
 from settlement.store import InMemoryStore
-from settlement.reconciliation import ingest_signal, resolve_reconciliation
-from settlement.gate import attempt_settlement, SettlementError
+from settlement.reconciliation import ingest_signal, resolve_reconciliation, auto_reconcile, MajorityPolicy
+from settlement.gate import attempt_settlement, set_default_id_generator, SettlementError
+from settlement.ids import ContentIds
+from settlement.audit import case_trace
 from settlement.ai_oracle import generate_ai_signals, AIGeneratorConfig
 
 
 def write_trace(name: str, case):
-    def normalize_signal(s):
-        if isinstance(s, dict):
-            return {"source": s.get("source"), "outcome": s.get("outcome"), "raw": s}
-        if isinstance(s, str):
-            if ":" in s:
-                left, right = s.split(":", 1)
-                return {"source": left.strip(), "outcome": right.strip(), "raw": s}
-            if "|" in s:
-                left, right = s.split("|", 1)
-                return {"source": left.strip(), "outcome": right.strip(), "raw": s}
-            return {"source": None, "outcome": None, "raw": s}
-        source = getattr(s, "source", None)
-        outcome = getattr(s, "outcome", None)
-        if source is not None or outcome is not None:
-            return {"source": source, "outcome": outcome, "raw": repr(s)}
-        return {"source": None, "outcome": None, "raw": repr(s)}
-
-    signals = getattr(case, "signals", [])
-    artifact = {
-        "scenario": name,
-        "case_id": getattr(case, "case_id", None),
-        "state": str(getattr(case, "state", None)),
-        "final_outcome": getattr(case, "final_outcome", None),
-        "signals": [normalize_signal(s) for s in (signals or [])],
-        "reconciliation_reason": getattr(case, "reconciliation_reason", None),
-        "settlement_id": getattr(case, "settlement_id", None),
-        "timestamp_utc": datetime.utcnow().isoformat() + "Z",
-    }
+    """Write a trace artifact for repo visitors (production code should use AuditSink)."""
+    artifact = case_trace(name, case)
 
     os.makedirs("examples/traces", exist_ok=True)
     path = os.path.join("examples", "traces", f"{name}_{artifact['case_id']}.json")
@@ -123,16 +98,24 @@ def scenario_ai_majority_policy():
         config=AIGeneratorConfig(seed=42, n_agents=5, conflict_rate=0.35),
     )
 
-    tally = {"YES": 0, "NO": 0}
     for s in signals:
         ok, reason = ingest_signal(case, s)
-        tally[s.outcome] = tally.get(s.outcome, 0) + 1
         print("ingest:", s.source, s.outcome, ok, reason, "state:", case.state)
 
-    # majority policy
-    chosen = "YES" if tally.get("YES", 0) >= tally.get("NO", 0) else "NO"
-    resolve_reconciliation(case, chosen_outcome=chosen)
-    print("majority chosen:", chosen, "finalized:", case.final_outcome, "state:", case.state)
+    # majority policy (automated reconciliation)
+    finalized = auto_reconcile(
+        [case],
+        MajorityPolicy(),
+        states=(CaseState.RESOLVED_PROVISIONAL, CaseState.IN_RECONCILIATION),
+    )
+    print("majority chosen:", finalized.get(case.case_id), "finalized:", case.final_outcome, "state:", case.state)
+
+    if case.case_id not in finalized:
+        # MajorityPolicy leaves ties undecided; break them toward YES as before.
+        counts = case.outcome_counts
+        chosen = "YES" if counts.get("YES", 0) >= counts.get("NO", 0) else "NO"
+        resolve_reconciliation(case, chosen_outcome=chosen)
+        print("tie broken:", chosen, "state:", case.state)
 
     sid = attempt_settlement(case)
     print("settled:", sid, "state:", case.state)
@@ -141,6 +124,8 @@ def scenario_ai_majority_policy():
 
 
 if __name__ == "__main__":
+    # Content-addressed ids, so the traces can be re-verified with settlement.replay
+    set_default_id_generator(ContentIds())
     scenario_ai_clean()
     scenario_ai_conflict()
     scenario_ai_majority_policy()
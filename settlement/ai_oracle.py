@@ -2,10 +2,16 @@
 
 from dataclasses import dataclass
 from random import Random
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
 
+from settlement.ids import format_uuid
 from settlement.models import OutcomeSignal
 
+try:  # optional: bulk generation
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on environment
+    np = None
+
 @dataclass
 class AIGeneratorConfig:
     seed: int = 1337
@@ -46,3 +52,155 @@ def generate_ai_signals(
             OutcomeSignal(case_id=case_id, source=f"ai_agent_{i+1}", outcome=outcome)
         )
     return agents
+
+
+# --- Bulk mode ---------------------------------------------------------------
+# For load tests: millions of cases per call, generated a batch of cases at a
+# time with numpy and streamed in arrival (received_at) order. No prompts or
+# heuristics; each case gets a random "true" outcome and agents disagree with
+# it at conflict_rate. Output is a pure function of the config (including
+# seed), and batch k only depends on (seed, k).
+
+
+@dataclass
+class BulkGeneratorConfig:
+    seed: int = 1337
+    n_cases: int = 1_000_000
+    agents_per_case: int = 3
+    outcomes: Sequence[str] = ("YES", "NO")
+    outcome_weights: Optional[Sequence[float]] = None  # prior over true outcomes; None = uniform
+    conflict_rate: float = 0.35                         # mean chance an agent disagrees
+    conflict_concentration: Optional[float] = None     # Beta(a, b) per-case rate with a + b = this; None = fixed
+    duplicate_rate: float = 0.0                         # chance a signal is re-delivered (same signal_id)
+    late_rate: float = 0.0                              # chance a signal arrives late_delay seconds late
+    late_delay: float = 60.0
+    arrival_skew: float = 0.0                           # mean exponential delay (s) after a case opens
+    start_time: float = 1_700_000_000.0
+    case_interval: float = 0.001                        # seconds between consecutive cases opening
+    batch_cases: int = 65_536
+    case_prefix: str = "case"
+    source_prefix: str = "ai_agent"
+
+
+_COLUMNS = ("case_index", "source_index", "outcome_index", "confidence", "received_at", "signal_key", "duplicate", "late")
+
+
+@dataclass
+class SignalBatch:
+    """
+    Columnar batch of generated signals, sorted by received_at.
+    Indexes refer to the config: case "<case_prefix>_<case_index>",
+    source "<source_prefix>_<source_index + 1>", outcome outcomes[outcome_index].
+    signal_key holds the 16 signal-id bytes per row (duplicates repeat them).
+    """
+    config: BulkGeneratorConfig
+    case_index: Any
+    source_index: Any
+    outcome_index: Any
+    confidence: Any
+    received_at: Any
+    signal_key: Any
+    duplicate: Any
+    late: Any
+
+    def __len__(self) -> int:
+        return len(self.case_index)
+
+    def signals(self, signal_cls: Callable[..., Any] = OutcomeSignal) -> Iterator[OutcomeSignal]:
+        cfg = self.config
+        sources = [f"{cfg.source_prefix}_{i + 1}" for i in range(cfg.agents_per_case)]
+        outcomes = list(cfg.outcomes)
+        prefix = cfg.case_prefix
+        h = self.signal_key.tobytes().hex()
+        rows = zip(
+            self.case_index.tolist(), self.source_index.tolist(), self.outcome_index.tolist(),
+            self.confidence.tolist(), self.received_at.tolist(),
+        )
+        for i, (c, src, o, conf, at) in enumerate(rows):
+            signal_id = format_uuid(h[32 * i:32 * i + 32], "4")
+            yield signal_cls(f"{prefix}_{c}", sources[src], outcomes[o], conf, at, signal_id)
+
+
+def _generate_batch(cfg: BulkGeneratorConfig, batch_no: int, lo: int, hi: int) -> Dict[str, Any]:
+    rng = np.random.default_rng([cfg.seed, batch_no])
+    k, agents, n_batch = len(cfg.outcomes), cfg.agents_per_case, hi - lo
+    n = n_batch * agents
+
+    if cfg.outcome_weights is None:
+        truth = rng.integers(0, k, n_batch)
+    else:
+        p = np.asarray(cfg.outcome_weights, dtype=np.float64)
+        truth = rng.choice(k, size=n_batch, p=p / p.sum())
+    if cfg.conflict_concentration and 0.0 < cfg.conflict_rate < 1.0:
+        a = cfg.conflict_rate * cfg.conflict_concentration
+        rate = rng.beta(a, cfg.conflict_concentration - a, n_batch)
+    else:
+        rate = np.full(n_batch, cfg.conflict_rate)
+
+    local = np.repeat(np.arange(n_batch), agents)
+    case_index = local + lo
+    true_outcome = truth[local]
+    # A dissenting agent picks uniformly among the other outcomes.
+    wrong = (true_outcome + rng.integers(1, k, n)) % k if k > 1 else true_outcome
+    conflicted = rng.random(n) < rate[local]
+
+    received_at = cfg.start_time + case_index * cfg.case_interval
+    if cfg.arrival_skew > 0:
+        received_at = received_at + rng.exponential(cfg.arrival_skew, n)
+    late = rng.random(n) < cfg.late_rate if cfg.late_rate > 0 else np.zeros(n, dtype=bool)
+    received_at[late] += cfg.late_delay
+
+    cols = {
+        "case_index": case_index,
+        "source_index": np.tile(np.arange(agents, dtype=np.int32), n_batch),
+        "outcome_index": np.where(conflicted, wrong, true_outcome).astype(np.int32),
+        "confidence": rng.uniform(0.5, 1.0, n),
+        "received_at": received_at,
+        "signal_key": np.frombuffer(rng.bytes(16 * n), dtype=np.uint8).reshape(n, 16),
+        "duplicate": np.zeros(n, dtype=bool),
+        "late": late,
+    }
+    if cfg.duplicate_rate > 0:
+        dup = np.flatnonzero(rng.random(n) < cfg.duplicate_rate)
+        copies = {name: col[dup] for name, col in cols.items()}
+        # A redelivery lands shortly after the original.
+        copies["received_at"] = copies["received_at"] + rng.exponential(max(cfg.arrival_skew, cfg.case_interval), len(dup))
+        copies["duplicate"][:] = True
+        cols = {name: np.concatenate([cols[name], copies[name]]) for name in _COLUMNS}
+    return cols
+
+
+def iter_bulk_batches(config: Optional[BulkGeneratorConfig] = None) -> Iterator[SignalBatch]:
+    """
+    Streams SignalBatch objects covering config.n_cases cases.
+    The concatenated stream is in received_at order: rows that arrive after
+    the current batch window (skewed, late or duplicate) are held back and
+    emitted with the batch whose window they fall in. Requires numpy.
+    """
+    if np is None:
+        raise ImportError("bulk signal generation requires numpy")
+    cfg = config or BulkGeneratorConfig()
+    if not cfg.outcomes:
+        raise ValueError("outcomes must not be empty")
+
+    pending: Optional[Dict[str, Any]] = None
+    for batch_no, lo in enumerate(range(0, cfg.n_cases, cfg.batch_cases)):
+        hi = min(lo + cfg.batch_cases, cfg.n_cases)
+        cols = _generate_batch(cfg, batch_no, lo, hi)
+        if pending is not None:
+            cols = {name: np.concatenate([pending[name], cols[name]]) for name in _COLUMNS}
+        # Every case of later batches opens at or after the cutoff.
+        cutoff = cfg.start_time + hi * cfg.case_interval if hi < cfg.n_cases else np.inf
+        ready = cols["received_at"] < cutoff
+        pending = {name: col[~ready] for name, col in cols.items()}
+        order = np.argsort(cols["received_at"][ready], kind="stable")
+        yield SignalBatch(cfg, **{name: col[ready][order] for name, col in cols.items()})
+
+
+def generate_bulk_signals(
+    config: Optional[BulkGeneratorConfig] = None,
+    signal_cls: Callable[..., Any] = OutcomeSignal,
+) -> Iterator[OutcomeSignal]:
+    """Streams signal objects (OutcomeSignal by default) in arrival order; see iter_bulk_batches."""
+    for batch in iter_bulk_batches(config):
+        yield from batch.signals(signal_cls)
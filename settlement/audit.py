@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from .models import Case, OutcomeSignal
+
+_STOP = object()
+
+
+def _signal_entry(sig: OutcomeSignal) -> Dict[str, Any]:
+    entry = {
+        "signal_id": sig.signal_id,
+        "source": sig.source,
+        "outcome": sig.outcome,
+        "confidence": sig.confidence,
+        "received_at": sig.received_at,
+    }
+    if sig.meta:
+        # seq / report_id feed the content dedup key; keep traces lossless.
+        entry["meta"] = dict(sig.meta)
+    return entry
+
+
+def case_trace(scenario: str, case: Case) -> Dict[str, Any]:
+    """Trace artifact for a case: state, outcome, every signal and settlement fields."""
+    return {
+        "scenario": scenario,
+        "case_id": case.case_id,
+        "state": str(case.state),
+        "final_outcome": case.final_outcome,
+        "signals": [_signal_entry(s) for s in case.signals.values()],
+        "reconciliation_reason": case.reconciliation_reason,
+        "settlement_id": case.settlement_id,
+        "timestamp_utc": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+    }
+
+
+class AuditSink:
+    """
+    Append-only audit log for traces and receipts.
+
+    Records are serialized to compact JSON lines and handed to a background
+    writer thread, so write() costs one encode plus a queue put on the
+    settlement path. The writer drains the queue in batches into segment
+    files (audit-00000000.ndjson[.gz]) and rotates to a new segment once a
+    segment reaches `segment_bytes`. With compress=True every batch is
+    appended as its own gzip member; concatenated members read back as one
+    stream (gzip.open / zcat).
+
+        sink = AuditSink("audit/")
+        sink.write_trace("market_close", case)
+        sink.write_receipt("pmkt_1", receipt)
+        sink.close()
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 64 * 1024 * 1024,
+        compress: bool = False,
+        max_batch: int = 4096,
+        max_pending: int = 100_000,
+    ) -> None:
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.compress = compress
+        self.max_batch = max_batch
+        self.records_written = 0
+        self.segments: List[str] = []
+
+        os.makedirs(directory, exist_ok=True)
+        existing = [n for n in os.listdir(directory) if n.startswith("audit-")]
+        self._segment_no = max((int(n.split("-")[1].split(".")[0]) for n in existing), default=-1) + 1
+        self._file = None
+        self._file_bytes = 0
+        self._error: Optional[BaseException] = None
+        self._closed = False
+
+        # Bounded so a stalled disk applies backpressure instead of growing memory.
+        self._queue: "queue.Queue" = queue.Queue(max_pending)
+        self._thread = threading.Thread(target=self._run, name="audit-sink", daemon=True)
+        self._thread.start()
+
+    # --- producer side ---------------------------------------------------
+
+    def write(self, kind: str, record: Dict[str, Any]) -> None:
+        if self._closed:
+            raise RuntimeError("audit sink is closed")
+        if self._error is not None:
+            raise RuntimeError("audit sink writer failed") from self._error
+        line = json.dumps({"kind": kind, "logged_at": time.time(), **record}, separators=(",", ":"))
+        self._queue.put(line.encode("utf-8") + b"\n")
+
+    def write_trace(self, scenario: str, case: Case) -> None:
+        self.write("trace", case_trace(scenario, case))
+
+    def write_receipt(self, name: str, receipt: Dict[str, Any]) -> None:
+        self.write("receipt", {"name": name, **receipt})
+
+    def flush(self) -> None:
+        """Blocks until every record written so far is on disk (OS buffers flushed)."""
+        self._queue.join()
+        if self._error is not None:
+            raise RuntimeError("audit sink writer failed") from self._error
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        if self._error is not None:
+            raise RuntimeError("audit sink writer failed") from self._error
+
+    def __enter__(self) -> "AuditSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # --- writer thread ---------------------------------------------------
+
+    def _open_segment(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        suffix = ".ndjson.gz" if self.compress else ".ndjson"
+        path = os.path.join(self.directory, f"audit-{self._segment_no:08d}{suffix}")
+        self._segment_no += 1
+        self._file = open(path, "ab")
+        self._file_bytes = 0
+        self.segments.append(path)
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = [b for b in batch if b is not _STOP]
+            stop = len(lines) != len(batch)
+            try:
+                if lines and self._error is None:
+                    self._write_batch(lines)
+            except BaseException as e:  # surfaced to producers on next call
+                self._error = e
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        if self._file is not None:
+            self._file.close()
+
+    def _write_batch(self, lines: List[bytes]) -> None:
+        if self._file is None or self._file_bytes >= self.segment_bytes:
+            self._open_segment()
+        data = b"".join(lines)
+        if self.compress:
+            data = gzip.compress(data, compresslevel=6)
+        self._file.write(data)
+        self._file.flush()
+        self._file_bytes += len(data)
+        self.records_written += len(lines)
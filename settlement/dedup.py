@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import math
+import os
+from array import array
+from collections import OrderedDict
+from random import Random
+from typing import Dict, List, Sequence, Set, Tuple
+
+from .models import Case, OutcomeSignal
+
+# Content-based duplicate detection for signals.
+#
+# signal_id only catches a redelivery of the very same object; a retried
+# oracle report arrives with a fresh uuid. The dedup key is instead
+# (case_id, source, outcome, sequence), where sequence is the first of
+# `meta_keys` present in sig.meta. Without a sequence, a source can report
+# a given outcome for a case once; sources that legitimately repeat an
+# outcome should send a sequence number or report id in meta.
+
+DEFAULT_META_KEYS = ("seq", "sequence", "report_id")
+
+DedupKey = Tuple[str, str, str, str]
+
+
+def dedup_key(sig: OutcomeSignal, meta_keys: Sequence[str] = DEFAULT_META_KEYS) -> DedupKey:
+    meta = sig.meta
+    if meta:
+        for name in meta_keys:
+            if name in meta:
+                return (sig.case_id, sig.source, sig.outcome, str(meta[name]))
+    return (sig.case_id, sig.source, sig.outcome, "")
+
+
+_TABLE_BITS = 12
+_mask_tables: Dict[int, List[int]] = {}
+
+
+def _mask_table(bits: int) -> List[int]:
+    """Fixed table of 64-bit masks with `bits` random bit positions each."""
+    table = _mask_tables.get(bits)
+    if table is None:
+        rng = Random(bits)
+        table = _mask_tables[bits] = [
+            sum(1 << p for p in rng.sample(range(64), bits)) for _ in range(1 << _TABLE_BITS)
+        ]
+    return table
+
+
+def _blocked_fp(items_per_word: float, k: int) -> float:
+    """Expected false-positive rate of a 64-bit-word blocked filter (Poisson word load)."""
+    fp, term, load = 0.0, math.exp(-items_per_word), 0
+    while load < items_per_word + 12 * math.sqrt(items_per_word) + 12:
+        fp += term * (1 - (1 - k / 64) ** load) ** k
+        load += 1
+        term *= items_per_word / load
+    return fp
+
+
+class BloomFilter:
+    """
+    Register-blocked Bloom filter over 64-bit hashes: each item sets k bits
+    inside a single 64-bit word, so a lookup is one word read and one mask
+    compare. The low 32 bits of the hash pick the word and the top 24 bits
+    pick the mask (two table lookups). Sized so the expected false-positive
+    rate at `capacity` items is at most `error_rate`; blocking needs roughly
+    1.5-2x the bits of a classic filter for that.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        if capacity <= 0 or not 0.0 < error_rate < 1.0:
+            raise ValueError("capacity must be positive and error_rate in (0, 1)")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # Smallest bits-per-item (with the best even k) that meets error_rate.
+        bits_per_item = -math.log(error_rate) / math.log(2) ** 2
+        while True:
+            items_per_word = 64 / bits_per_item
+            k = min((2, 4, 6, 8, 10, 12), key=lambda k: _blocked_fp(items_per_word, k))
+            if _blocked_fp(items_per_word, k) <= error_rate:
+                break
+            bits_per_item *= 1.05
+        self.k = k
+        self.n_words = max(1, math.ceil(capacity / items_per_word))
+        self.words = array("Q", bytes(8 * self.n_words))
+        self._table = _mask_table(k // 2)
+        self.count = 0
+
+    # Word / mask computation is inlined in both methods: they are the hot path.
+
+    def __contains__(self, h: int) -> bool:
+        table = self._table
+        mask = table[(h >> 40) & 0xFFF] | table[(h >> 52) & 0xFFF]
+        return self.words[(h & 0xFFFFFFFF) % self.n_words] & mask == mask
+
+    def add(self, h: int) -> bool:
+        """Sets the item's bits; returns True if they were all set already."""
+        table = self._table
+        mask = table[(h >> 40) & 0xFFF] | table[(h >> 52) & 0xFFF]
+        i = (h & 0xFFFFFFFF) % self.n_words
+        word = self.words[i]
+        if word & mask == mask:
+            return True
+        self.words[i] = word | mask
+        self.count += 1
+        return False
+
+
+class DedupIndex:
+    """
+    Global content-dedup index for ingest_signal / ingest_signals.
+
+    A Bloom filter answers "definitely new" for almost every fresh signal
+    without touching the case. On a filter hit the case's exact key set is
+    consulted; key sets are built from case.signals on demand and kept for
+    the `cached_cases` most recently hit cases. Memory is therefore the
+    filter words plus a bounded cache, whatever the number of signals. When
+    more than `capacity` keys have been added, a new filter twice as large
+    (at half the error rate) is stacked on top, so the overall false
+    positive rate stays below 2 * error_rate.
+
+    Hashes use the built-in (per-process salted) hash, so an index is only
+    meaningful inside the process that built it. The first time a Case
+    object reaches check_and_add, the signals it already carries (loaded
+    from a store, recovered after a restart, or ingested before the index
+    was installed) are added with add_case, so a redelivery of one of them
+    is still caught. The object is then marked with the index's token;
+    signals put into case.signals directly afterwards are not seen.
+
+        dedup = DedupIndex(capacity=50_000_000)
+        ingest_signal(case, sig, dedup=dedup)   # or set_default_dedup(dedup)
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+        cached_cases: int = 4096,
+        meta_keys: Sequence[str] = DEFAULT_META_KEYS,
+    ) -> None:
+        self.meta_keys = tuple(meta_keys)
+        self.cached_cases = cached_cases
+        self.filters: List[BloomFilter] = [BloomFilter(capacity, error_rate)]
+        self._case_keys: "OrderedDict[str, Set[DedupKey]]" = OrderedDict()
+        # Random rather than a counter: Case objects carry it across processes.
+        self.token = int.from_bytes(os.urandom(8), "little") | 1
+        self.duplicates = 0
+        self.false_positives = 0
+
+    @property
+    def memory_bytes(self) -> int:
+        """Filter words only (the case key cache is bounded by cached_cases)."""
+        return sum(8 * f.n_words for f in self.filters)
+
+    def _keys_for(self, case: Case) -> Set[DedupKey]:
+        keys = self._case_keys.get(case.case_id)
+        if keys is None:
+            meta_keys = self.meta_keys
+            keys = {dedup_key(s, meta_keys) for s in case.signals.values()}
+            self._case_keys[case.case_id] = keys
+            if len(self._case_keys) > self.cached_cases:
+                self._case_keys.popitem(last=False)
+        else:
+            self._case_keys.move_to_end(case.case_id)
+        return keys
+
+    def add_case(self, case: Case) -> None:
+        """Adds the keys of the signals already on the case (e.g. one loaded from a store)."""
+        meta_keys = self.meta_keys
+        for s in case.signals.values():
+            key = dedup_key(s, meta_keys)
+            self.filters[-1].add(hash(key))
+            self._remember(case, key)
+        case._dedup_token = self.token
+
+    def check_and_add(self, case: Case, sig: OutcomeSignal) -> bool:
+        """True if sig duplicates a signal already on the case; otherwise records it."""
+        if case._dedup_token != self.token:
+            self.add_case(case)
+        key = dedup_key(sig, self.meta_keys)
+        h = hash(key)
+        filters = self.filters
+        hit = len(filters) > 1 and any(h in f for f in filters[:-1])
+        if not filters[-1].add(h) and not hit:
+            self._remember(case, key)
+            return False
+        if key in self._keys_for(case):
+            self.duplicates += 1
+            return True
+        self.false_positives += 1
+        self._remember(case, key)
+        return False
+
+    def _remember(self, case: Case, key: DedupKey) -> None:
+        top = self.filters[-1]
+        if top.count >= top.capacity:
+            self.filters.append(BloomFilter(top.capacity * 2, top.error_rate / 2))
+        keys = self._case_keys.get(case.case_id)
+        if keys is not None:
+            keys.add(key)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Callable, List
+
+from .models import Case, CaseState, OutcomeSignal
+
+# Observers of the core control plane. Listeners run synchronously, after the
+# change has been applied to the case, in registration order. Signal
+# validators run before a new signal is stored: raising rejects the signal
+# and leaves the case untouched, so work that can fail (e.g. encoding a
+# journal record) belongs there rather than in a listener.
+#
+# The lists are process-global and keep their owners alive: close() every
+# EventLogStore, IndexedStore, TieredStore and CaseDeadlines (or use them as
+# context managers), or they keep running on every change in the process.
+TransitionListener = Callable[[Case, CaseState, CaseState], None]  # (case, old, new)
+SignalListener = Callable[[Case, OutcomeSignal], None]             # (case, sig)
+
+transition_listeners: List[TransitionListener] = []
+signal_listeners: List[SignalListener] = []
+signal_validators: List[SignalListener] = []
+
+
+def add_transition_listener(fn: TransitionListener) -> None:
+    transition_listeners.append(fn)
+
+
+def remove_transition_listener(fn: TransitionListener) -> None:
+    if fn in transition_listeners:
+        transition_listeners.remove(fn)
+
+
+def add_signal_listener(fn: SignalListener) -> None:
+    signal_listeners.append(fn)
+
+
+def remove_signal_listener(fn: SignalListener) -> None:
+    if fn in signal_listeners:
+        signal_listeners.remove(fn)
+
+
+def add_signal_validator(fn: SignalListener) -> None:
+    signal_validators.append(fn)
+
+
+def remove_signal_validator(fn: SignalListener) -> None:
+    if fn in signal_validators:
+        signal_validators.remove(fn)
@@ -1,28 +1,156 @@
 from __future__ import annotations
+import threading
 import time
-import uuid
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Union
+from .ids import RandomIds, SettlementIdGenerator
 from .models import Case, CaseState
-from .state_machine import set_state
+from .state_machine import set_state, set_state_many
+from .store import InMemoryStore, IndexedStore
+from . import metrics
 
 
 class SettlementError(Exception):
     pass
 
 
-def attempt_settlement(case: Case) -> str:
+# Used when no generator is passed; see settlement/ids.py for the
+# deterministic (ContentIds) and time-ordered (MonotonicIds) alternatives.
+_default_ids: SettlementIdGenerator = RandomIds()
+
+
+def set_default_id_generator(ids: SettlementIdGenerator) -> None:
+    global _default_ids
+    _default_ids = ids
+
+
+def default_id_generator() -> SettlementIdGenerator:
+    return _default_ids
+
+
+def attempt_settlement(case: Case, ids: Optional[SettlementIdGenerator] = None) -> str:
     """
     Exactly-once settlement gate.
-    Returns settlement_id if settled or already settled.
+    Returns settlement_id if settled or already settled. A FINAL case that
+    already carries a settlement_id (e.g. from an interrupted settle_many)
+    is settled with that id instead of a new one.
     """
+    t0 = metrics.perf_counter_ns() if metrics.enabled else 0
+
     # If already settled, return the existing settlement ID (idempotent)
     if case.state == CaseState.SETTLED and case.settlement_id:
+        if t0:
+            metrics.record("attempt_settlement", t0, "already_settled")
         return case.settlement_id
 
     if case.state != CaseState.FINAL:
+        if t0:
+            metrics.record("attempt_settlement", t0, "settlement_blocked")
         raise SettlementError(f"Case not FINAL (state={case.state}); cannot settle")
 
     # Settle once
-    case.settlement_id = str(uuid.uuid4())
+    case.settlement_id = case.settlement_id or (ids or _default_ids)(case)
     case.settled_at = time.time()
     set_state(case, CaseState.SETTLED)
+    if t0:
+        metrics.record("attempt_settlement", t0, "settled")
     return case.settlement_id
+
+
+@dataclass
+class SettlementBatch:
+    """
+    Result table of settle_many, one row per settled or already-settled case.
+    status[i] is "settled" (settled by this call) or "already_settled".
+    Cases that were not FINAL are only counted in `blocked`; a case listed
+    more than once (by case_id) gets a single row.
+    """
+    settled_at: float
+    case_ids: List[str] = field(default_factory=list)
+    settlement_ids: List[str] = field(default_factory=list)
+    status: List[str] = field(default_factory=list)
+    blocked: int = 0
+
+    def __len__(self) -> int:
+        return len(self.case_ids)
+
+
+def settle_many(
+    cases: Union[InMemoryStore, Iterable[Case]],
+    ids: Optional[SettlementIdGenerator] = None,
+) -> SettlementBatch:
+    """
+    Bulk exactly-once settlement (e.g., at market close).
+    Accepts a store or any iterable of cases. FINAL cases are settled with
+    one shared settled_at timestamp; SETTLED cases return their existing
+    settlement_id. Safe to retry after a partial failure: a FINAL case that
+    already received a settlement_id keeps it instead of being re-minted.
+    For an IndexedStore only its FINAL cases are visited (O(result)).
+    """
+    t0 = metrics.perf_counter_ns() if metrics.enabled else 0
+    if isinstance(cases, IndexedStore):
+        cases = cases.cases_in_state(CaseState.FINAL)
+    elif isinstance(cases, InMemoryStore):
+        cases = cases.cases.values()
+
+    batch = SettlementBatch(settled_at=time.time())
+    to_settle: List[Case] = []
+    rows: List[int] = []
+    seen = set()
+    for case in cases:
+        if case.case_id in seen:
+            continue
+        seen.add(case.case_id)
+        if case.state == CaseState.SETTLED and case.settlement_id:
+            batch.case_ids.append(case.case_id)
+            batch.settlement_ids.append(case.settlement_id)
+            batch.status.append("already_settled")
+        elif case.state == CaseState.FINAL:
+            rows.append(len(batch.case_ids))
+            to_settle.append(case)
+            batch.case_ids.append(case.case_id)
+            batch.settlement_ids.append(case.settlement_id)  # filled in below
+            batch.status.append("settled")
+        else:
+            batch.blocked += 1
+
+    new_ids = iter((ids or _default_ids).many([c for c in to_settle if not c.settlement_id]))
+    for row, case in zip(rows, to_settle):
+        if not case.settlement_id:
+            case.settlement_id = next(new_ids)
+        case.settled_at = batch.settled_at
+        batch.settlement_ids[row] = case.settlement_id
+    # All cases were checked FINAL above, so this cannot reject any of them.
+    set_state_many(to_settle, CaseState.SETTLED)
+    if t0:
+        metrics.record("settle_many", t0)
+        metrics.incr("settle_many.settled", len(to_settle))
+        metrics.incr("settle_many.already_settled", len(batch.case_ids) - len(to_settle))
+        metrics.incr("settle_many.settlement_blocked", batch.blocked)
+    return batch
+
+
+class StripedSettlementGate:
+    """
+    Thread-safe wrapper around attempt_settlement.
+
+    Each case_id hashes to one of a fixed pool of locks, so unrelated cases
+    settle in parallel while concurrent attempts on the same case serialize
+    and all observe the single settlement_id (exactly-once).
+    """
+
+    def __init__(self, stripes: int = 64, ids: Optional[SettlementIdGenerator] = None) -> None:
+        if stripes < 1:
+            raise ValueError("stripes must be >= 1")
+        self.ids = ids
+        self._locks: List[threading.Lock] = [threading.Lock() for _ in range(stripes)]
+
+    def lock_for(self, case_id: str) -> threading.Lock:
+        return self._locks[hash(case_id) % len(self._locks)]
+
+    def attempt_settlement(self, case: Case) -> str:
+        # Lock-free fast path for replays of an already settled case.
+        if case.state == CaseState.SETTLED and case.settlement_id:
+            return case.settlement_id
+        with self.lock_for(case.case_id):
+            return attempt_settlement(case, self.ids)
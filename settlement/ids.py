@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from typing import Callable, List, Optional, Sequence
+
+from .models import Case
+
+# All generators return strings in the canonical 8-4-4-4-12 uuid layout, so
+# they are interchangeable with the uuid4 ids the gate used to mint.
+
+# RFC 4122 variant bits (10xx) for the first nibble of the 4th group.
+_VARIANT_NIBBLE = {f"{i:x}": f"{(i & 0x3) | 0x8:x}" for i in range(16)}
+
+
+def format_uuid(h: str, version: str) -> str:
+    """Formats 32 hex chars as a uuid string with the given version nibble."""
+    return f"{h[:8]}-{h[8:12]}-{version}{h[13:16]}-{_VARIANT_NIBBLE[h[16]]}{h[17:20]}-{h[20:32]}"
+
+
+class SettlementIdGenerator:
+    """Mints settlement ids for cases that are about to move to SETTLED."""
+
+    def __call__(self, case: Case) -> str:
+        return self.many([case])[0]
+
+    def many(self, cases: Sequence[Case]) -> List[str]:
+        raise NotImplementedError
+
+
+class RandomIds(SettlementIdGenerator):
+    """uuid4-format ids; one entropy read per batch instead of one per id."""
+
+    def many(self, cases: Sequence[Case]) -> List[str]:
+        n = len(cases)
+        h = os.urandom(16 * n).hex()
+        return [format_uuid(h[i:i + 32], "4") for i in range(0, 32 * n, 32)]
+
+
+class ContentIds(SettlementIdGenerator):
+    """
+    Content-addressed ids: blake2b(namespace, case_id, final_outcome).
+    The same case settled to the same outcome always gets the same id, so
+    replays of an event log reproduce settlement ids exactly. Use a distinct
+    namespace per market / deployment to keep ids from colliding across them.
+    """
+
+    def __init__(self, namespace: str = "settlement") -> None:
+        self.namespace = namespace
+        self._prefix = hashlib.blake2b(namespace.encode("utf-8"), digest_size=16)
+
+    def __call__(self, case: Case) -> str:
+        h = self._prefix.copy()
+        h.update(f"\x00{case.case_id}\x00{case.final_outcome or ''}".encode("utf-8"))
+        return format_uuid(h.hexdigest(), "8")
+
+    def many(self, cases: Sequence[Case]) -> List[str]:
+        return [self(case) for case in cases]
+
+
+class MonotonicIds(SettlementIdGenerator):
+    """
+    Time-ordered, sortable ids (uuid v7 layout): 48-bit unix milliseconds,
+    then a 42-bit per-process counter, then a 32-bit node id. Ids from one
+    generator sort in mint order even if the clock steps backwards. A batch
+    reserves a contiguous counter block under one lock acquisition.
+
+    With a fixed `node` and an injected `clock`, the sequence is reproducible.
+    """
+
+    def __init__(self, node: Optional[int] = None, clock: Callable[[], float] = time.time) -> None:
+        self.node = (node if node is not None else int.from_bytes(os.urandom(4), "big")) & 0xFFFFFFFF
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._counter = 0
+
+    def _reserve(self, n: int):
+        with self._lock:
+            ms = max(int(self._clock() * 1000), self._last_ms)
+            if ms != self._last_ms:
+                self._last_ms, self._counter = ms, 0
+            start = self._counter
+            self._counter += n
+            if self._counter >= 1 << 42:
+                raise OverflowError("counter block exhausted for this millisecond")
+            return ms, start
+
+    def many(self, cases: Sequence[Case]) -> List[str]:
+        ms, start = self._reserve(len(cases))
+        prefix = f"{ms & 0xFFFFFFFFFFFF:012x}"
+        out = []
+        for counter in range(start, start + len(cases)):
+            # 12 bits of counter after the version nibble, 30 after the variant bits.
+            hi, lo = counter >> 30, counter & 0x3FFFFFFF
+            tail = f"{(0b10 << 62) | (lo << 32) | self.node:016x}"
+            out.append(f"{prefix[:8]}-{prefix[8:]}-7{hi:03x}-{tail[:4]}-{tail[4:]}")
+        return out
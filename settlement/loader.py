@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import uuid
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .models import Case, OutcomeSignal
+from .reconciliation import ingest_signals
+from .store import InMemoryStore
+
+# --- NDJSON ----------------------------------------------------------------
+# One object per line with the OutcomeSignal field names; case_id, source and
+# outcome are required, the rest default exactly as in OutcomeSignal.
+
+
+def write_ndjson(path: str, signals: Iterable[OutcomeSignal]) -> int:
+    n = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for s in signals:
+            record = {
+                "case_id": s.case_id,
+                "source": s.source,
+                "outcome": s.outcome,
+                "confidence": s.confidence,
+                "received_at": s.received_at,
+                "signal_id": s.signal_id,
+            }
+            if s.meta:
+                record["meta"] = dict(s.meta)
+            f.write(json.dumps(record, separators=(",", ":")))
+            f.write("\n")
+            n += 1
+    return n
+
+
+def iter_ndjson(path: str, signal_cls: Callable[..., Any] = OutcomeSignal) -> Iterator[OutcomeSignal]:
+    """Lazily yields signals from an NDJSON file through a memory map."""
+    decode = json.JSONDecoder().decode
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b""):
+                line = line.strip()
+                if line:
+                    yield signal_cls(**decode(line.decode("utf-8")))
+
+
+# --- Binary ----------------------------------------------------------------
+# File: b"DSGSIG1\n", then self-contained blocks so readers only ever hold one
+# block's string table:
+#   <u32 n_strings><u32 n_records>
+#   n_strings x (<u16 len> utf-8 bytes)                  block-local string table
+#   n_records x <u32 case><u32 source><u32 outcome><f64 confidence><f64 received_at><16s signal uuid>
+# Signal ids must be uuid strings (the OutcomeSignal default); meta is not stored.
+
+BINARY_MAGIC = b"DSGSIG1\n"
+_BLOCK = struct.Struct("<II")
+_STRLEN = struct.Struct("<H")
+_RECORD = struct.Struct("<IIIdd16s")
+
+
+def write_binary(path: str, signals: Iterable[OutcomeSignal], block_size: int = 65536) -> int:
+    n = 0
+    with open(path, "wb") as f:
+        f.write(BINARY_MAGIC)
+        strings: Dict[str, int] = {}
+        records: List[bytes] = []
+
+        def flush() -> None:
+            table = [_STRLEN.pack(len(b)) + b for b in (s.encode("utf-8") for s in strings)]
+            f.write(_BLOCK.pack(len(table), len(records)))
+            f.write(b"".join(table))
+            f.write(b"".join(records))
+            strings.clear()
+            records.clear()
+
+        def code(s: str) -> int:
+            c = strings.get(s)
+            if c is None:
+                c = strings[s] = len(strings)
+            return c
+
+        for s in signals:
+            if s.meta:
+                raise ValueError(f"signal {s.signal_id}: meta is not supported by the binary format")
+            records.append(_RECORD.pack(
+                code(s.case_id), code(s.source), code(s.outcome),
+                s.confidence, s.received_at, uuid.UUID(s.signal_id).bytes,
+            ))
+            n += 1
+            if len(records) >= block_size:
+                flush()
+        if records:
+            flush()
+    return n
+
+
+def iter_binary_records(path: str) -> Iterator[Tuple[str, str, str, float, float, str]]:
+    """
+    Lazily yields (case_id, source, outcome, confidence, received_at, signal_id)
+    tuples from a binary signal file via a memory map, one block at a time.
+    """
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+                raise ValueError(f"{path}: not a binary signal file")
+            pos, size = len(BINARY_MAGIC), len(mm)
+            while pos < size:
+                n_strings, n_records = _BLOCK.unpack_from(mm, pos)
+                pos += _BLOCK.size
+                table = []
+                for _ in range(n_strings):
+                    (length,) = _STRLEN.unpack_from(mm, pos)
+                    pos += _STRLEN.size
+                    table.append(str(mm[pos:pos + length], "utf-8"))
+                    pos += length
+                end = pos + n_records * _RECORD.size
+                # One block is copied out of the map at a time, so memory stays
+                # bounded by the block size whatever the file size.
+                for c, s, o, conf, at, sid in _RECORD.iter_unpack(mm[pos:end]):
+                    h = sid.hex()
+                    yield (table[c], table[s], table[o], conf, at,
+                           f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}")
+                pos = end
+
+
+def iter_binary(path: str, signal_cls: Callable[..., Any] = OutcomeSignal) -> Iterator[OutcomeSignal]:
+    """Lazily yields signals from a binary signal file."""
+    for case_id, source, outcome, confidence, received_at, signal_id in iter_binary_records(path):
+        yield signal_cls(case_id, source, outcome, confidence, received_at, signal_id)
+
+
+# --- Routing ---------------------------------------------------------------
+
+
+def ingest_stream(
+    signals: Iterable[OutcomeSignal],
+    store: Optional[InMemoryStore] = None,
+    run_size: int = 1024,
+) -> InMemoryStore:
+    """
+    Routes a signal stream into per-case ingest without materializing it.
+    Consecutive signals for the same case are ingested together with
+    ingest_signals (at most run_size at a time); cases missing from the
+    store are created. Returns the store.
+    """
+    store = store if store is not None else InMemoryStore()
+    run: List[OutcomeSignal] = []
+    run_case: Optional[Case] = None
+
+    for sig in signals:
+        if run_case is None or sig.case_id != run_case.case_id or len(run) >= run_size:
+            if run:
+                ingest_signals(run_case, run)
+                run = []
+            run_case = store.get_case(sig.case_id)
+            if run_case is None:
+                run_case = Case(case_id=sig.case_id)
+                store.put_case(run_case)
+        run.append(sig)
+    if run:
+        ingest_signals(run_case, run)
+    return store
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Hot-path instrumentation for the control plane.
+#
+# Instrumented functions check the module-level `enabled` flag once and do
+# nothing else while it is False. When enabled, every thread records into
+# its own counters and histograms (no locks on the hot path); snapshot()
+# merges them. Histograms are HDR-style log-linear: values in nanoseconds
+# are bucketed by power of two with 2**SUB_BUCKET_BITS linear sub-buckets,
+# which bounds the relative error of reported percentiles to ~6%.
+
+enabled = False
+
+SUB_BUCKET_BITS = 4
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_N_BUCKETS = 64 * _SUB_BUCKETS
+
+perf_counter_ns = time.perf_counter_ns
+
+
+def enable() -> None:
+    global enabled
+    enabled = True
+
+
+def disable() -> None:
+    global enabled
+    enabled = False
+
+
+class _ThreadMetrics:
+    __slots__ = ("counters", "histograms")
+
+    def __init__(self) -> None:
+        self.counters: Dict[str, int] = {}
+        self.histograms: Dict[str, List[int]] = {}
+
+
+_local = threading.local()
+_all: List[_ThreadMetrics] = []
+_all_lock = threading.Lock()
+
+
+def _mine() -> _ThreadMetrics:
+    m = getattr(_local, "m", None)
+    if m is None:
+        m = _local.m = _ThreadMetrics()
+        with _all_lock:  # once per thread
+            _all.append(m)
+    return m
+
+
+def _bucket(ns: int) -> int:
+    if ns < _SUB_BUCKETS:
+        return max(ns, 0)
+    shift = ns.bit_length() - SUB_BUCKET_BITS - 1
+    return ((shift + 1) << SUB_BUCKET_BITS) + ((ns >> shift) & (_SUB_BUCKETS - 1))
+
+
+def _bucket_value(index: int) -> int:
+    """Upper bound (ns) of a bucket; used when reporting percentiles."""
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    if shift < 0:
+        return index
+    return (((_SUB_BUCKETS | (index & (_SUB_BUCKETS - 1))) + 1) << shift) - 1
+
+
+def incr(name: str, n: int = 1) -> None:
+    counters = _mine().counters
+    counters[name] = counters.get(name, 0) + n
+
+
+def observe_ns(stage: str, ns: int) -> None:
+    histograms = _mine().histograms
+    h = histograms.get(stage)
+    if h is None:
+        h = histograms[stage] = [0] * _N_BUCKETS
+    h[_bucket(ns)] += 1
+
+
+def record(stage: str, t0: int, reason: Optional[str] = None) -> None:
+    """Records the latency since t0 (from perf_counter_ns) and an optional reason code."""
+    m = _mine()
+    ns = perf_counter_ns() - t0
+    h = m.histograms.get(stage)
+    if h is None:
+        h = m.histograms[stage] = [0] * _N_BUCKETS
+    h[_bucket(ns)] += 1
+    if reason is not None:
+        key = _keys.get((stage, reason))
+        if key is None:
+            key = _counter_key(stage, reason)
+        m.counters[key] = m.counters.get(key, 0) + 1
+
+
+_keys: Dict[tuple, str] = {}
+
+
+def _counter_key(stage: str, reason: str) -> str:
+    # Reason codes may carry details after ':' or '='; count by code.
+    key = f"{stage}.{reason.split(':', 1)[0].split('=', 1)[0]}"
+    if len(_keys) < 4096:  # details are unbounded; cache only the common ones
+        _keys[(stage, reason)] = key
+    return key
+
+
+def reset() -> None:
+    with _all_lock:
+        for m in _all:
+            m.counters.clear()
+            m.histograms.clear()
+
+
+def snapshot() -> Dict[str, Dict]:
+    """Merged view across threads: counters plus count / p50 / p90 / p99 / max (ns) per stage."""
+    counters: Dict[str, int] = {}
+    merged: Dict[str, List[int]] = {}
+    with _all_lock:
+        threads = list(_all)
+    for m in threads:
+        for name, n in list(m.counters.items()):
+            counters[name] = counters.get(name, 0) + n
+        for stage, h in list(m.histograms.items()):
+            acc = merged.setdefault(stage, [0] * _N_BUCKETS)
+            for i, n in enumerate(h):
+                if n:
+                    acc[i] += n
+
+    latency: Dict[str, Dict[str, int]] = {}
+    for stage, h in merged.items():
+        total = sum(h)
+        stats = {"count": total}
+        targets = [("p50", 0.50), ("p90", 0.90), ("p99", 0.99), ("max", 1.0)]
+        seen, t = 0, 0
+        for i, n in enumerate(h):
+            seen += n
+            while t < len(targets) and n and seen >= targets[t][1] * total:
+                stats[f"{targets[t][0]}_ns"] = _bucket_value(i)
+                t += 1
+        latency[stage] = stats
+    return {"counters": counters, "latency": latency}
+
+
+def render_prometheus(prefix: str = "settlement") -> str:
+    """Snapshot in Prometheus text exposition format."""
+    snap = snapshot()
+    lines = []
+    for name, n in sorted(snap["counters"].items()):
+        stage, _, code = name.partition(".")
+        lines.append(f'{prefix}_events_total{{stage="{stage}",code="{code}"}} {n}')
+    for stage, stats in sorted(snap["latency"].items()):
+        lines.append(f'{prefix}_latency_count{{stage="{stage}"}} {stats["count"]}')
+        for q in ("p50", "p90", "p99", "max"):
+            if f"{q}_ns" in stats:
+                lines.append(f'{prefix}_latency_ns{{stage="{stage}",quantile="{q}"}} {stats[q + "_ns"]}')
+    return "\n".join(lines) + "\n"
+
+
+def write_snapshot(path: str) -> None:
+    """Atomically writes snapshot() as JSON for a local scraper to read."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"timestamp": time.time(), **snapshot()}, f)
+    os.replace(tmp, path)
+
+
+def start_exporter(path: str, interval: float = 5.0) -> Callable[[], None]:
+    """Writes a snapshot to `path` every `interval` seconds; returns a stop function."""
+    stop = threading.Event()
+
+    def loop() -> None:
+        while not stop.wait(interval):
+            write_snapshot(path)
+        write_snapshot(path)
+
+    thread = threading.Thread(target=loop, name="metrics-exporter", daemon=True)
+    thread.start()
+
+    def stop_exporter() -> None:
+        stop.set()
+        thread.join()
+
+    return stop_exporter
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+from array import array
+from collections.abc import MutableMapping
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional, Dict, Any
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Iterator, List, Mapping
+import sys
 import time
 import uuid
 
@@ -26,6 +30,159 @@ class OutcomeSignal:
     meta: Dict[str, Any] = field(default_factory=dict)
 
 
+_EMPTY_META: Mapping[str, Any] = MappingProxyType({})
+
+
+class CompactSignal:
+    """
+    Memory-compact, drop-in alternative to OutcomeSignal.
+
+    Same constructor and attributes, but slotted (no per-instance __dict__),
+    with `source` / `outcome` interned and `meta` only allocated when
+    non-empty (an empty read-only mapping is returned otherwise).
+    Instances are immutable like the frozen OutcomeSignal.
+    """
+
+    __slots__ = ("case_id", "source", "outcome", "confidence", "received_at", "signal_id", "_meta")
+
+    def __init__(
+        self,
+        case_id: str,
+        source: str,
+        outcome: str,
+        confidence: float = 1.0,
+        received_at: Optional[float] = None,
+        signal_id: Optional[str] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        _set = object.__setattr__
+        _set(self, "case_id", case_id)
+        _set(self, "source", sys.intern(source))
+        _set(self, "outcome", sys.intern(outcome))
+        _set(self, "confidence", confidence)
+        _set(self, "received_at", time.time() if received_at is None else received_at)
+        _set(self, "signal_id", str(uuid.uuid4()) if signal_id is None else signal_id)
+        _set(self, "_meta", meta or None)
+
+    @property
+    def meta(self) -> Mapping[str, Any]:
+        return self._meta if self._meta is not None else _EMPTY_META
+
+    @classmethod
+    def from_signal(cls, sig: "OutcomeSignal") -> "CompactSignal":
+        return cls(sig.case_id, sig.source, sig.outcome, sig.confidence, sig.received_at, sig.signal_id, sig.meta)
+
+    def to_signal(self) -> OutcomeSignal:
+        return OutcomeSignal(
+            self.case_id, self.source, self.outcome, self.confidence,
+            self.received_at, self.signal_id, dict(self.meta),
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"cannot assign to field {name!r}")
+
+    def __reduce__(self) -> tuple:
+        # Rebuild through __init__ (pickle, copy, multiprocessing): the
+        # default slot restore would go through the blocked __setattr__.
+        return (CompactSignal, (self.case_id, self.source, self.outcome, self.confidence,
+                                self.received_at, self.signal_id, self._meta))
+
+    def _key(self) -> tuple:
+        return (self.case_id, self.source, self.outcome, self.confidence,
+                self.received_at, self.signal_id, dict(self.meta))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (CompactSignal, OutcomeSignal)):
+            return self._key() == CompactSignal._key(other)
+        return NotImplemented
+
+    __hash__ = None  # like OutcomeSignal, whose meta dict makes it unhashable
+
+    def __repr__(self) -> str:
+        return (
+            f"CompactSignal(case_id={self.case_id!r}, source={self.source!r}, outcome={self.outcome!r}, "
+            f"confidence={self.confidence!r}, received_at={self.received_at!r}, "
+            f"signal_id={self.signal_id!r}, meta={dict(self.meta)!r})"
+        )
+
+
+class SignalColumns(MutableMapping):
+    """
+    Columnar signal storage for one case; usable as Case.signals.
+
+    Behaves like the Dict[signal_id, OutcomeSignal] it replaces (insertion
+    ordered, append-only), but keeps each field in a parallel array:
+    sources and outcomes as small integer codes, confidence and
+    received_at as packed doubles, and meta only for signals that have it.
+    Values are materialized as CompactSignal on access.
+
+        case = Case(case_id="c1", signals=SignalColumns())
+    """
+
+    def __init__(self) -> None:
+        self._row: Dict[str, int] = {}   # signal_id -> row
+        self._ids: List[str] = []
+        self._case_ids: List[str] = []   # usually one distinct value, shared
+        self._source: array = array("I")
+        self._outcome: array = array("I")
+        self._confidence: array = array("d")
+        self._received_at: array = array("d")
+        self._meta: Dict[int, Dict[str, Any]] = {}
+        self._labels: List[str] = []     # code -> source/outcome string
+        self._codes: Dict[str, int] = {}
+
+    def _code(self, label: str) -> int:
+        code = self._codes.get(label)
+        if code is None:
+            code = self._codes[label] = len(self._labels)
+            self._labels.append(sys.intern(label))
+        return code
+
+    def __setitem__(self, signal_id: str, sig: Any) -> None:
+        if signal_id in self._row:
+            raise ValueError(f"signal {signal_id!r} already stored (signals are append-only)")
+        row = len(self._ids)
+        self._row[signal_id] = row
+        self._ids.append(signal_id)
+        case_id = sig.case_id
+        self._case_ids.append(self._case_ids[-1] if self._case_ids and self._case_ids[-1] == case_id else case_id)
+        self._source.append(self._code(sig.source))
+        self._outcome.append(self._code(sig.outcome))
+        self._confidence.append(sig.confidence)
+        self._received_at.append(sig.received_at)
+        if sig.meta:
+            self._meta[row] = dict(sig.meta)
+
+    def _signal(self, row: int) -> CompactSignal:
+        return CompactSignal(
+            self._case_ids[row],
+            self._labels[self._source[row]],
+            self._labels[self._outcome[row]],
+            self._confidence[row],
+            self._received_at[row],
+            self._ids[row],
+            self._meta.get(row),
+        )
+
+    def __getitem__(self, signal_id: str) -> CompactSignal:
+        return self._signal(self._row[signal_id])
+
+    def __delitem__(self, signal_id: str) -> None:
+        raise TypeError("signals are append-only")
+
+    def __contains__(self, signal_id: object) -> bool:
+        return signal_id in self._row
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def values(self):
+        return [self._signal(row) for row in range(len(self._ids))]
+
+
 @dataclass
 class Case:
     case_id: str
@@ -43,3 +200,42 @@ class Case:
 
     # Reconciliation / dispute notes
     reconciliation_reason: Optional[str] = None
+
+    # Derived indexes over `signals`, maintained incrementally on ingest.
+    # outcome -> number of signals / summed confidence
+    outcome_counts: Dict[str, int] = field(default_factory=dict, repr=False, compare=False)
+    outcome_weights: Dict[str, float] = field(default_factory=dict, repr=False, compare=False)
+    # source -> signal_ids in arrival order
+    signals_by_source: Dict[str, List[str]] = field(default_factory=dict, repr=False, compare=False)
+    _indexed: int = field(default=0, repr=False, compare=False)
+    # DedupIndex.token of the index that holds this object's signals (0 = none)
+    _dedup_token: int = field(default=0, repr=False, compare=False)
+
+    def index_signal(self, sig: OutcomeSignal) -> bool:
+        """
+        Records an already-stored signal in the derived indexes.
+        Returns True if its outcome had not been seen on this case before.
+        """
+        if self._indexed != len(self.signals) - 1:
+            # Signals were added without going through the index
+            # (e.g., constructed directly or loaded from a store).
+            self.rebuild_indexes()
+            return self.outcome_counts.get(sig.outcome) == 1
+
+        self._indexed += 1
+        count = self.outcome_counts.get(sig.outcome, 0)
+        self.outcome_counts[sig.outcome] = count + 1
+        self.outcome_weights[sig.outcome] = self.outcome_weights.get(sig.outcome, 0.0) + sig.confidence
+        self.signals_by_source.setdefault(sig.source, []).append(sig.signal_id)
+        return count == 0
+
+    def rebuild_indexes(self) -> None:
+        """Recomputes the derived indexes from `signals` (O(N))."""
+        self.outcome_counts = {}
+        self.outcome_weights = {}
+        self.signals_by_source = {}
+        for s in self.signals.values():
+            self.outcome_counts[s.outcome] = self.outcome_counts.get(s.outcome, 0) + 1
+            self.outcome_weights[s.outcome] = self.outcome_weights.get(s.outcome, 0.0) + s.confidence
+            self.signals_by_source.setdefault(s.source, []).append(s.signal_id)
+        self._indexed = len(self.signals)
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import json
+import os
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .gate import SettlementError
+from .models import Case, CaseState
+
+try:  # optional: vectorized payout pass
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on environment
+    np = None
+
+# All money is integer minor units (e.g. cents); no floats anywhere.
+# Fixed odds are decimal odds x ODDS_SCALE, so 2.5 is stored as 25_000.
+ODDS_SCALE = 10_000
+BPS = 10_000
+
+_INT64_MAX = (1 << 63) - 1
+
+
+class StakeBook:
+    """
+    Columnar stakes for one case: parallel account / outcome-code / amount /
+    odds columns. Amounts are positive ints in minor units; odds are only
+    used by fixed-odds payouts (0 = not set).
+
+        book = StakeBook("pmkt_case_1")
+        book.add("alice", "YES", 5_000)
+        book.extend(accounts, outcomes, amounts)
+    """
+
+    def __init__(self, case_id: str) -> None:
+        self.case_id = case_id
+        self.accounts: List[str] = []
+        self.outcome_codes = array("i")
+        self.amounts = array("q")
+        self.odds = array("q")
+        self.outcomes: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.accounts)
+
+    def code_for(self, outcome: str) -> Optional[int]:
+        return self._codes.get(outcome)
+
+    def _code(self, outcome: str) -> int:
+        code = self._codes.get(outcome)
+        if code is None:
+            code = self._codes[outcome] = len(self.outcomes)
+            self.outcomes.append(outcome)
+        return code
+
+    def add(self, account: str, outcome: str, amount: int, odds: int = 0) -> None:
+        if not isinstance(amount, int) or amount <= 0:
+            raise ValueError(f"stake amount must be a positive int in minor units, got {amount!r}")
+        if not isinstance(odds, int) or odds < 0:
+            raise ValueError(f"odds must be a non-negative int (x{ODDS_SCALE}), got {odds!r}")
+        self.accounts.append(account)
+        self.outcome_codes.append(self._code(outcome))
+        self.amounts.append(amount)
+        self.odds.append(odds)
+
+    def extend(
+        self,
+        accounts: Iterable[str],
+        outcomes: Iterable[str],
+        amounts: Iterable[int],
+        odds: Optional[Iterable[int]] = None,
+    ) -> None:
+        """Bulk add; the columns are validated before any row is appended."""
+        accounts = list(accounts)
+        codes = array("i", (self._code(o) for o in outcomes))
+        amounts = array("q", amounts)  # TypeError on floats
+        odds = array("q", odds) if odds is not None else array("q", bytes(8 * len(accounts)))
+        if not len(accounts) == len(codes) == len(amounts) == len(odds):
+            raise ValueError("accounts, outcomes, amounts and odds must have the same length")
+        if amounts and min(amounts) <= 0:
+            raise ValueError("stake amounts must be positive")
+        if odds and min(odds) < 0:
+            raise ValueError("odds must be non-negative")
+        self.accounts.extend(accounts)
+        self.outcome_codes.extend(codes)
+        self.amounts.extend(amounts)
+        self.odds.extend(odds)
+
+
+@dataclass
+class PayoutResult:
+    """
+    Payouts for one settlement. rows[i] indexes the StakeBook row paid
+    amounts[i] minor units. Pari-mutuel payouts sum exactly to pool - fee;
+    with no winning stakes every stake is refunded (refunded=True).
+    """
+    settlement_id: str
+    case_id: str
+    final_outcome: str
+    mode: str
+    pool: int
+    fee: int
+    paid: int
+    rows: array
+    amounts: array
+    refunded: bool = False
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "settlement_id": self.settlement_id,
+            "case_id": self.case_id,
+            "final_outcome": self.final_outcome,
+            "mode": self.mode,
+            "pool": self.pool,
+            "fee": self.fee,
+            "paid": self.paid,
+            "payouts": len(self.rows),
+            "refunded": self.refunded,
+        }
+
+
+def _to_array(values) -> array:
+    out = array("q")
+    if np is not None and isinstance(values, np.ndarray):
+        out.frombytes(values.astype(np.int64).tobytes())
+    else:
+        out.extend(values)
+    return out
+
+
+def _pool(book: StakeBook) -> int:
+    if np is not None and len(book):
+        return int(np.frombuffer(book.amounts, dtype=np.int64).sum())
+    return sum(book.amounts)
+
+
+def _split_pool(pool: int, weights: List[int]) -> List[int]:
+    """Exact largest-remainder split of pool in proportion to weights (ties -> lower row)."""
+    total = sum(weights)
+    base = [pool * w // total for w in weights]
+    short = pool - sum(base)
+    if short:
+        rem = [pool * w % total for w in weights]
+        for i in sorted(range(len(weights)), key=lambda i: (-rem[i], i))[:short]:
+            base[i] += 1
+    return base
+
+
+class PayoutLedger:
+    """
+    Computes payouts for SETTLED cases, once per settlement_id.
+
+    mode="pari_mutuel": the pool (all stakes, less fee_bps) is split among
+    winning stakes pro rata. Each payout is floor(share), and the leftover
+    minor units go one each to the largest fractional remainders, so the
+    payouts add up to the distributable pool exactly.
+    mode="fixed_odds": each winning stake pays floor(stake * odds / ODDS_SCALE).
+
+    pay() refuses cases that attempt_settlement has not settled, and a
+    repeated pay() for the same settlement_id returns the recorded result.
+    """
+
+    MODES = ("pari_mutuel", "fixed_odds")
+
+    def __init__(self, mode: str = "pari_mutuel", fee_bps: int = 0) -> None:
+        if mode not in self.MODES:
+            raise ValueError(f"mode must be one of {self.MODES}, got {mode!r}")
+        if not 0 <= fee_bps <= BPS:
+            raise ValueError("fee_bps must be between 0 and 10000")
+        self.mode = mode
+        self.fee_bps = fee_bps
+        self._results: Dict[str, PayoutResult] = {}
+
+    def result_for(self, settlement_id: str) -> Optional[PayoutResult]:
+        return self._results.get(settlement_id)
+
+    def pay(self, case: Case, book: StakeBook) -> PayoutResult:
+        if case.state != CaseState.SETTLED or not case.settlement_id:
+            raise SettlementError(f"Case not SETTLED (state={case.state}); cannot pay out")
+        if book.case_id != case.case_id:
+            raise ValueError(f"stake book is for {book.case_id}, not {case.case_id}")
+        done = self._results.get(case.settlement_id)
+        if done is not None:
+            return done
+
+        if self.mode == "pari_mutuel":
+            result = self._pari_mutuel(case, book)
+        else:
+            result = self._fixed_odds(case, book)
+        # Concurrent callers may both compute; the first stored result wins.
+        return self._results.setdefault(case.settlement_id, result)
+
+    def _result(self, case: Case, pool: int, fee: int, rows, amounts, refunded: bool = False) -> PayoutResult:
+        paid = int(amounts.sum()) if np is not None and isinstance(amounts, np.ndarray) else sum(amounts)
+        rows, amounts = _to_array(rows), _to_array(amounts)
+        return PayoutResult(
+            settlement_id=case.settlement_id,
+            case_id=case.case_id,
+            final_outcome=case.final_outcome,
+            mode=self.mode,
+            pool=pool,
+            fee=fee,
+            paid=paid,
+            rows=rows,
+            amounts=amounts,
+            refunded=refunded,
+        )
+
+    def _pari_mutuel(self, case: Case, book: StakeBook) -> PayoutResult:
+        pool = _pool(book)
+        code = book.code_for(case.final_outcome)
+        if np is not None:
+            codes = np.frombuffer(book.outcome_codes, dtype=np.int32)
+            stakes = np.frombuffer(book.amounts, dtype=np.int64)
+            rows = np.flatnonzero(codes == code) if code is not None else np.empty(0, dtype=np.int64)
+            weights = stakes[rows]
+        else:
+            rows = [i for i, c in enumerate(book.outcome_codes) if c == code]
+            weights = [book.amounts[i] for i in rows]
+
+        if not len(rows):
+            # Nobody backed the final outcome: refund every stake, no fee.
+            return self._result(case, pool, 0, range(len(book)), book.amounts, refunded=True)
+
+        fee = pool * self.fee_bps // BPS
+        distributable = pool - fee
+        if np is None or distributable * int(weights.max()) > _INT64_MAX:
+            return self._result(case, pool, fee, rows, _split_pool(distributable, [int(w) for w in weights]))
+
+        total = int(weights.sum())
+        scaled = weights * distributable
+        payouts = scaled // total
+        short = distributable - int(payouts.sum())
+        if short:
+            # One extra unit to each of the `short` largest remainders, ties
+            # by row order; partition instead of a full sort.
+            rem = scaled % total
+            cut = np.partition(rem, len(rem) - short)[len(rem) - short]
+            above = rem > cut
+            payouts[above] += 1
+            payouts[np.flatnonzero(rem == cut)[:short - int(above.sum())]] += 1
+        return self._result(case, pool, fee, rows, payouts)
+
+    def _fixed_odds(self, case: Case, book: StakeBook) -> PayoutResult:
+        pool = _pool(book)
+        code = book.code_for(case.final_outcome)
+        if code is None:
+            return self._result(case, pool, 0, [], [])
+        if np is not None:
+            codes = np.frombuffer(book.outcome_codes, dtype=np.int32)
+            rows = np.flatnonzero(codes == code)
+            stakes = np.frombuffer(book.amounts, dtype=np.int64)[rows]
+            odds = np.frombuffer(book.odds, dtype=np.int64)[rows]
+            if len(rows) and not odds.all():
+                raise ValueError(f"{int((odds == 0).sum())} winning stake(s) have no odds")
+            if not len(rows) or int(stakes.max()) * int(odds.max()) <= _INT64_MAX:
+                return self._result(case, pool, 0, rows, stakes * odds // ODDS_SCALE)
+            rows = rows.tolist()
+        else:
+            rows = [i for i, c in enumerate(book.outcome_codes) if c == code]
+        if any(book.odds[i] == 0 for i in rows):
+            raise ValueError("winning stake(s) have no odds")
+        return self._result(case, pool, 0, rows, [book.amounts[i] * book.odds[i] // ODDS_SCALE for i in rows])
+
+
+# --- Receipts ----------------------------------------------------------------
+
+
+def iter_receipt_lines(result: PayoutResult, book: StakeBook, chunk_rows: int = 65536) -> Iterator[bytes]:
+    """
+    NDJSON receipt in chunks of up to chunk_rows lines: one summary line,
+    then {"account", "stake", "payout"} per paid row.
+    """
+    yield (json.dumps({"kind": "payout_summary", **result.summary()}, separators=(",", ":")) + "\n").encode("utf-8")
+    dumps = json.dumps
+    accounts, stakes = book.accounts, book.amounts
+    rows, amounts = result.rows, result.amounts
+    for start in range(0, len(rows), chunk_rows):
+        lines = [
+            f'{{"account":{dumps(accounts[r])},"stake":{stakes[r]},"payout":{p}}}\n'
+            for r, p in zip(rows[start:start + chunk_rows], amounts[start:start + chunk_rows])
+        ]
+        yield "".join(lines).encode("utf-8")
+
+
+def write_receipts(path: str, result: PayoutResult, book: StakeBook) -> int:
+    """Writes the NDJSON receipt atomically; returns the number of payout lines."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        for chunk in iter_receipt_lines(result, book):
+            f.write(chunk)
+    os.replace(tmp, path)
+    return len(result.rows)
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional
+
+from .gate import attempt_settlement, SettlementError
+from .models import Case, CaseState, OutcomeSignal
+from .reconciliation import ingest_signal, resolve_reconciliation
+from .store import InMemoryStore
+
+# Chooses the final outcome for a case awaiting finality (e.g., calls an
+# arbiter API); returning None leaves the case where it is.
+Resolver = Callable[[Case], Awaitable[Optional[str]]]
+# Called once per case after settlement (e.g., posts to the payout ledger).
+SettledHook = Callable[[Case, str], Awaitable[None]]
+# Called with (stage, item, exception) when processing one item fails.
+ErrorHook = Callable[[str, Any, Exception], None]
+
+_STOP = object()
+
+
+class SettlementPipeline:
+    """
+    asyncio pipeline: ingest -> reconcile -> gate, connected by bounded queues.
+
+    Work is split into `concurrency` lanes by hash(case_id). Each stage of a
+    lane is one task reading one FIFO queue, so all events for a case are
+    processed in submission order, while different lanes (and the awaits in
+    `resolver` / `on_settled`) overlap. submit() blocks when a lane's ingest
+    queue is full, which pushes backpressure onto the producer.
+
+    An exception while handling one item (a resolver timeout, a failing
+    on_settled hook, ...) is counted in `errors` and passed to `on_error`;
+    the lane keeps running. Without on_error, close() re-raises the first
+    such exception once the queues are drained.
+
+        pipeline = SettlementPipeline(store, resolver=choose, on_settled=pay)
+        await pipeline.start()
+        await pipeline.submit(sig)
+        await pipeline.close()   # drains all queues
+    """
+
+    def __init__(
+        self,
+        store: Optional[InMemoryStore] = None,
+        resolver: Optional[Resolver] = None,
+        on_settled: Optional[SettledHook] = None,
+        concurrency: int = 8,
+        queue_size: int = 1024,
+        on_error: Optional[ErrorHook] = None,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        self.store = store if store is not None else InMemoryStore()
+        self.resolver = resolver
+        self.on_settled = on_settled
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.on_error = on_error
+
+        self.ingested = 0
+        self.finalized = 0
+        self.settled = 0
+        self.blocked = 0
+        self.errors = 0
+        self._failure: Optional[Exception] = None
+
+        self._ingest_q: List[asyncio.Queue] = []
+        self._reconcile_q: List[asyncio.Queue] = []
+        self._gate_q: List[asyncio.Queue] = []
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        for lane in range(self.concurrency):
+            self._ingest_q.append(asyncio.Queue(self.queue_size))
+            self._reconcile_q.append(asyncio.Queue(self.queue_size))
+            self._gate_q.append(asyncio.Queue(self.queue_size))
+            self._tasks.append(asyncio.create_task(self._ingest_stage(lane)))
+            self._tasks.append(asyncio.create_task(self._reconcile_stage(lane)))
+            self._tasks.append(asyncio.create_task(self._gate_stage(lane)))
+
+    def _lane(self, case_id: str) -> int:
+        return hash(case_id) % self.concurrency
+
+    async def submit(self, sig: OutcomeSignal) -> None:
+        await self._ingest_q[self._lane(sig.case_id)].put(sig)
+
+    async def settle(self, case_id: str) -> None:
+        """Queues a case finalized outside the pipeline for the gate stage."""
+        case = self.store.get_case(case_id)
+        if case is not None:
+            await self._gate_q[self._lane(case_id)].put(case)
+
+    async def close(self) -> None:
+        """Stops accepting work, drains every stage and waits for the lane tasks."""
+        for q in self._ingest_q:
+            await q.put(_STOP)
+        await asyncio.gather(*self._tasks)
+        self._tasks.clear()
+        if self._failure is not None:
+            failure, self._failure = self._failure, None
+            raise RuntimeError(f"{self.errors} pipeline item(s) failed; first error attached") from failure
+
+    def _item_failed(self, stage: str, item: Any, exc: Exception) -> None:
+        self.errors += 1
+        if self.on_error is not None:
+            try:
+                self.on_error(stage, item, exc)
+                return
+            except Exception as hook_exc:
+                exc = hook_exc
+        if self._failure is None:
+            self._failure = exc
+
+    # --- stages ----------------------------------------------------------
+
+    async def _ingest_stage(self, lane: int) -> None:
+        q, out = self._ingest_q[lane], self._reconcile_q[lane]
+        while True:
+            sig = await q.get()
+            if sig is _STOP:
+                await out.put(_STOP)
+                return
+            try:
+                case = self.store.get_case(sig.case_id)
+                if case is None:
+                    case = Case(case_id=sig.case_id)
+                    self.store.put_case(case)
+                ingest_signal(case, sig)
+            except Exception as e:
+                self._item_failed("ingest", sig, e)
+                continue
+            self.ingested += 1
+            if self.resolver is not None and case.state in (
+                CaseState.RESOLVED_PROVISIONAL,
+                CaseState.IN_RECONCILIATION,
+            ):
+                await out.put(case)
+
+    async def _reconcile_stage(self, lane: int) -> None:
+        q, out = self._reconcile_q[lane], self._gate_q[lane]
+        while True:
+            case = await q.get()
+            if case is _STOP:
+                await out.put(_STOP)
+                return
+            # A case may be queued once per signal; later entries see it FINAL.
+            if case.state not in (CaseState.RESOLVED_PROVISIONAL, CaseState.IN_RECONCILIATION):
+                continue
+            try:
+                chosen = await self.resolver(case)
+                if chosen is None or case.state not in (
+                    CaseState.RESOLVED_PROVISIONAL,
+                    CaseState.IN_RECONCILIATION,
+                ):
+                    continue
+                resolve_reconciliation(case, chosen_outcome=chosen)
+            except Exception as e:
+                self._item_failed("reconcile", case, e)
+                continue
+            self.finalized += 1
+            await out.put(case)
+
+    async def _gate_stage(self, lane: int) -> None:
+        q = self._gate_q[lane]
+        while True:
+            case = await q.get()
+            if case is _STOP:
+                return
+            if case.state == CaseState.SETTLED:
+                continue
+            try:
+                sid = attempt_settlement(case)
+            except SettlementError:
+                self.blocked += 1
+                continue
+            except Exception as e:
+                self._item_failed("gate", case, e)
+                continue
+            self.settled += 1
+            if self.on_settled is not None:
+                try:
+                    await self.on_settled(case, sid)
+                except Exception as e:
+                    self._item_failed("on_settled", case, e)
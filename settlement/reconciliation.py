@@ -1,50 +1,345 @@
 from __future__ import annotations
-from typing import Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 from .models import Case, CaseState, OutcomeSignal
-from .state_machine import set_state
+from .state_machine import set_state, set_state_many
+from .events import signal_listeners, signal_validators
+from .dedup import DedupIndex
+from . import metrics
 
+try:  # optional: vectorized tally policies
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on environment
+    np = None
 
-def ingest_signal(case: Case, sig: OutcomeSignal) -> Tuple[bool, str]:
+# Content dedup used when ingest is not given one explicitly (None = off).
+_default_dedup: Optional[DedupIndex] = None
+
+
+def set_default_dedup(dedup: Optional[DedupIndex]) -> None:
+    global _default_dedup
+    _default_dedup = dedup
+
+
+def ingest_signal(case: Case, sig: OutcomeSignal, dedup: Optional[DedupIndex] = None) -> Tuple[bool, str]:
     """
     Adds a signal and determines whether:
       - it is consistent (can move toward FINAL), or
       - it introduces conflict (must reconcile).
+    With a DedupIndex (argument or set_default_dedup), a signal whose
+    content key matches one already on the case is also ignored.
     Returns (ok, reason).
     """
+    t0 = metrics.perf_counter_ns() if metrics.enabled else 0
+
     # Idempotent signal ingest: ignore duplicate signal_id
     if sig.signal_id in case.signals:
+        if t0:
+            metrics.record("ingest_signal", t0, "duplicate_signal_ignored")
         return True, "duplicate_signal_ignored"
 
+    # May reject the signal (raise) before the case is touched.
+    for fn in signal_validators:
+        fn(case, sig)
+
+    dedup = dedup or _default_dedup
+    if dedup is not None and dedup.check_and_add(case, sig):
+        if t0:
+            metrics.record("ingest_signal", t0, "duplicate_content_ignored")
+        return True, "duplicate_content_ignored"
+
     case.signals[sig.signal_id] = sig
+    new_outcome = case.index_signal(sig)
+    for fn in signal_listeners:
+        fn(case, sig)
 
     # If already FINAL or SETTLED, we don't change the final outcome.
     if case.state in (CaseState.FINAL, CaseState.SETTLED):
+        if t0:
+            metrics.record("ingest_signal", t0, "case_already_final_or_settled")
         return True, "case_already_final_or_settled"
 
-    # Determine if signals conflict.
-    outcomes = {s.outcome for s in case.signals.values()}
-
-    if len(outcomes) == 1:
+    # Determine if signals conflict (O(1) via the maintained outcome tally).
+    if len(case.outcome_counts) == 1:
         # No conflict so far; provisional resolution.
         if case.state == CaseState.OPEN:
             set_state(case, CaseState.RESOLVED_PROVISIONAL)
+        if t0:
+            metrics.record("ingest_signal", t0, "consistent_outcome_signals")
         return True, "consistent_outcome_signals"
     else:
-        # Conflict detected → reconciliation required
-        case.reconciliation_reason = f"conflicting_outcomes={sorted(list(outcomes))}"
+        # Conflict detected → reconciliation required.
+        # The reason only changes when a previously unseen outcome arrives.
+        if new_outcome or case.reconciliation_reason is None:
+            case.reconciliation_reason = f"conflicting_outcomes={sorted(case.outcome_counts)}"
         if case.state != CaseState.IN_RECONCILIATION:
             set_state(case, CaseState.IN_RECONCILIATION)
+        if t0:
+            metrics.record("ingest_signal", t0, case.reconciliation_reason)
         return False, case.reconciliation_reason
 
 
+def restore_signal(case: Case, sig: OutcomeSignal) -> None:
+    """
+    Re-applies a signal that was already accepted (e.g. read back from a
+    journal). The case ends in the same state and reason as after
+    ingest_signal, but no validators, listeners, dedup or metrics run and
+    the state is assigned directly rather than through set_state.
+    """
+    if sig.signal_id in case.signals:
+        return
+    case.signals[sig.signal_id] = sig
+    new_outcome = case.index_signal(sig)
+    if case.state in (CaseState.FINAL, CaseState.SETTLED):
+        return
+    if len(case.outcome_counts) == 1:
+        if case.state == CaseState.OPEN:
+            case.state = CaseState.RESOLVED_PROVISIONAL
+    else:
+        if new_outcome or case.reconciliation_reason is None:
+            case.reconciliation_reason = f"conflicting_outcomes={sorted(case.outcome_counts)}"
+        case.state = CaseState.IN_RECONCILIATION
+
+
+def ingest_signals(
+    case: Case,
+    signals: Iterable[OutcomeSignal],
+    dedup: Optional[DedupIndex] = None,
+) -> List[Tuple[bool, str]]:
+    """
+    Bulk form of ingest_signal for bursts of signals on one case.
+    Accepts any iterable (list or generator). Each signal gets the same
+    (ok, reason) it would get from sequential ingest_signal calls, and the
+    case ends in the same state, but the state transition is applied once
+    at the end of the batch instead of per signal.
+    """
+    t0 = metrics.perf_counter_ns() if metrics.enabled else 0
+    results: List[Tuple[bool, str]] = []
+    seen = case.signals
+    state = case.state
+    reason = case.reconciliation_reason
+    final_or_settled = state in (CaseState.FINAL, CaseState.SETTLED)
+    dedup = dedup or _default_dedup
+
+    try:
+        for sig in signals:
+            if sig.signal_id in seen:
+                results.append((True, "duplicate_signal_ignored"))
+                continue
+            for fn in signal_validators:
+                fn(case, sig)
+            if dedup is not None and dedup.check_and_add(case, sig):
+                results.append((True, "duplicate_content_ignored"))
+                continue
+
+            seen[sig.signal_id] = sig
+            new_outcome = case.index_signal(sig)
+            for fn in signal_listeners:
+                fn(case, sig)
+
+            if final_or_settled:
+                results.append((True, "case_already_final_or_settled"))
+            elif len(case.outcome_counts) == 1:
+                if state == CaseState.OPEN:
+                    state = CaseState.RESOLVED_PROVISIONAL
+                results.append((True, "consistent_outcome_signals"))
+            else:
+                if new_outcome or reason is None:
+                    reason = f"conflicting_outcomes={sorted(case.outcome_counts)}"
+                state = CaseState.IN_RECONCILIATION
+                results.append((False, reason))
+    finally:
+        # On a rejected signal, the ones stored before it still get their state.
+        if not final_or_settled:
+            case.reconciliation_reason = reason
+            if state != case.state:
+                set_state(case, state)
+    if t0:
+        metrics.record("ingest_signals", t0)
+        for _, r in results:
+            metrics.incr("ingest_signal." + r.split("=", 1)[0])
+    return results
+
+
+def majority_outcome(case: Case, weighted: bool = False) -> Optional[str]:
+    """
+    Returns the outcome with the most signals (or the highest summed
+    confidence if weighted=True), or None if there is no unique leader.
+    """
+    tally = case.outcome_weights if weighted else case.outcome_counts
+    if not tally:
+        return None
+    ranked = sorted(tally.items(), key=lambda kv: kv[1], reverse=True)
+    if len(ranked) > 1 and ranked[0][1] == ranked[1][1]:
+        return None
+    return ranked[0][0]
+
+
 def resolve_reconciliation(case: Case, chosen_outcome: str) -> None:
     """
     Operator/arbiter/automated rule chooses final outcome.
     This locks finality.
     """
+    t0 = metrics.perf_counter_ns() if metrics.enabled else 0
     if case.state not in (CaseState.RESOLVED_PROVISIONAL, CaseState.IN_RECONCILIATION):
         raise ValueError("Can only finalize from RESOLVED_PROVISIONAL or IN_RECONCILIATION")
 
     case.final_outcome = chosen_outcome
     case.reconciliation_reason = None
     set_state(case, CaseState.FINAL)
+    if t0:
+        metrics.record("resolve_reconciliation", t0)
+
+
+# --- Automated reconciliation policies ------------------------------------
+
+
+class ReconciliationPolicy:
+    """
+    Chooses a final outcome for a case, or None to leave it for an operator.
+    Policies only read the case; auto_reconcile applies their decisions.
+    """
+
+    def decide(self, case: Case) -> Optional[str]:
+        raise NotImplementedError
+
+    def decide_batch(self, cases: Sequence[Case]) -> List[Optional[str]]:
+        return [self.decide(c) for c in cases]
+
+
+class _TallyPolicy(ReconciliationPolicy):
+    """Picks the unique leader of a per-outcome tally if its share clears min_share."""
+
+    weighted = False
+
+    def __init__(self, min_share: float = 0.5, min_signals: int = 1) -> None:
+        self.min_share = min_share
+        self.min_signals = min_signals
+
+    def _tally(self, case: Case) -> Dict[str, float]:
+        return case.outcome_weights if self.weighted else case.outcome_counts
+
+    def _accept(self, top: float, runner_up: float, total: float, count: int) -> bool:
+        return count >= self.min_signals and top > runner_up and total > 0 and top / total > self.min_share
+
+    def decide(self, case: Case) -> Optional[str]:
+        tally = self._tally(case)
+        if not tally:
+            return None
+        ranked = sorted(tally.items(), key=lambda kv: kv[1], reverse=True)
+        top = ranked[0][1]
+        runner_up = ranked[1][1] if len(ranked) > 1 else float("-inf")
+        if self._accept(top, runner_up, sum(tally.values()), len(case.signals)):
+            return ranked[0][0]
+        return None
+
+    def decide_batch(self, cases: Sequence[Case]) -> List[Optional[str]]:
+        if np is None or len(cases) < 64:
+            return [self.decide(c) for c in cases]
+
+        # One (cases x outcomes) matrix, then leader / runner-up / share per row.
+        column: Dict[str, int] = {}
+        rows, cols, vals = [], [], []
+        for i, case in enumerate(cases):
+            for outcome, v in self._tally(case).items():
+                j = column.get(outcome)
+                if j is None:
+                    j = column[outcome] = len(column)
+                rows.append(i)
+                cols.append(j)
+                vals.append(v)
+        if not column:
+            return [None] * len(cases)
+        labels = list(column)
+        m = np.zeros((len(cases), max(len(labels), 2)), dtype=np.float64)
+        m[rows, cols] = vals
+
+        leader = m.argmax(axis=1)
+        top2 = -np.partition(-m, 1, axis=1)[:, :2]
+        total = m.sum(axis=1)
+        counts = np.fromiter((len(c.signals) for c in cases), dtype=np.int64, count=len(cases))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ok = (
+                (counts >= self.min_signals)
+                & (top2[:, 0] > top2[:, 1])
+                & (total > 0)
+                & (top2[:, 0] / total > self.min_share)
+            )
+        return [labels[j] if accepted else None for j, accepted in zip(leader.tolist(), ok.tolist())]
+
+
+class MajorityPolicy(_TallyPolicy):
+    """Outcome with more than `min_share` of all signals (default: strict majority)."""
+
+
+class WeightedPolicy(_TallyPolicy):
+    """Like MajorityPolicy, but each signal counts with its confidence."""
+
+    weighted = True
+
+
+class QuorumPolicy(_TallyPolicy):
+    """Outcome reported by at least `quorum` signals, with no tie for the lead."""
+
+    def __init__(self, quorum: int) -> None:
+        super().__init__(min_share=0.0)
+        self.quorum = quorum
+
+    def _accept(self, top: float, runner_up: float, total: float, count: int) -> bool:
+        return top >= self.quorum and top > runner_up
+
+    def decide_batch(self, cases: Sequence[Case]) -> List[Optional[str]]:
+        return [self.decide(c) for c in cases]
+
+
+class SourcePriorityPolicy(ReconciliationPolicy):
+    """Latest outcome from the highest-priority source that has reported."""
+
+    def __init__(self, priority: Sequence[str]) -> None:
+        self.priority = list(priority)
+
+    def decide(self, case: Case) -> Optional[str]:
+        for source in self.priority:
+            signal_ids = case.signals_by_source.get(source)
+            if signal_ids:
+                return case.signals[signal_ids[-1]].outcome
+        return None
+
+
+def auto_reconcile(
+    cases: Union["InMemoryStore", Iterable[Case]],
+    policy: ReconciliationPolicy,
+    states: Tuple[CaseState, ...] = (CaseState.IN_RECONCILIATION,),
+) -> Dict[str, str]:
+    """
+    Runs `policy` over every case in `states` as one batch and finalizes the
+    cases it decides. Returns {case_id: chosen_outcome} for finalized cases.
+    Accepts a store (an IndexedStore is swept via its state index) or cases.
+    """
+    from .store import IndexedStore, InMemoryStore
+
+    if any(s not in (CaseState.RESOLVED_PROVISIONAL, CaseState.IN_RECONCILIATION) for s in states):
+        raise ValueError("Can only finalize from RESOLVED_PROVISIONAL or IN_RECONCILIATION")
+
+    t0 = metrics.perf_counter_ns() if metrics.enabled else 0
+    if isinstance(cases, IndexedStore):
+        pending = [c for state in states for c in cases.cases_in_state(state)]
+    else:
+        if isinstance(cases, InMemoryStore):
+            cases = cases.cases.values()
+        pending = [c for c in cases if c.state in states]
+
+    finalized: Dict[str, str] = {}
+    decided: List[Case] = []
+    for case, chosen in zip(pending, policy.decide_batch(pending)):
+        if chosen is not None:
+            # Same effect as resolve_reconciliation, with one bulk transition.
+            case.final_outcome = chosen
+            case.reconciliation_reason = None
+            decided.append(case)
+            finalized[case.case_id] = chosen
+    set_state_many(decided, CaseState.FINAL)
+    if t0:
+        metrics.record("auto_reconcile", t0)
+        metrics.incr("auto_reconcile.finalized", len(decided))
+        metrics.incr("auto_reconcile.undecided", len(pending) - len(decided))
+    return finalized
@@ -0,0 +1,416 @@
+from __future__ import annotations
+
+import gzip
+import json
+import mmap
+import multiprocessing as mp
+import os
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .gate import attempt_settlement, SettlementError
+from .ids import ContentIds
+from .models import Case, CaseState, OutcomeSignal
+from .reconciliation import ingest_signal, resolve_reconciliation
+from .sharding import shard_for
+from .state_machine import InvalidTransition
+from .store import _EV_PUT, _EV_REPLACE, _EV_SIGNAL, _EV_TRANSITION, _FRAME, _SNAP_CASE, _STATE_BY_VALUE
+
+# Deterministic replay / verification of recorded histories.
+#
+# Inputs are read as one ordered stream of per-case events:
+#   _SIGNAL  [signal_id, source, outcome, confidence, received_at, meta]
+#   _CHECK   [state, final_outcome, settlement_id, reconciliation_reason]
+#            as recorded at that point of the history
+#   _BROKEN  reason the record cannot be replayed
+#   _RESET   the case was replaced by a new object (put_case); start over
+# Sources: an EventLogStore directory (latest snapshot + newer log
+# segments; every put_case / transition is a check), case_trace JSON files
+# and AuditSink segments (all of a trace's signals, then its end state).
+
+_SIGNAL, _CHECK, _BROKEN, _RESET = 0, 1, 2, 3
+
+# Records are compact JSON written by json.dumps: scan_once skips the
+# whitespace handling of decode().
+_scan_json = json.JSONDecoder().scan_once
+_FINALIZED = (CaseState.FINAL, CaseState.SETTLED)
+
+Event = Tuple[str, int, Any, Tuple[str, int]]  # (case_id, kind, fields, (path, record index))
+
+
+@dataclass
+class Divergence:
+    """First mismatch on a case; `where` is the record (path#index) it was found at."""
+    case_id: str
+    attribute: str
+    recorded: Any
+    replayed: Any
+    where: str
+
+
+@dataclass
+class ReplayReport:
+    events: int = 0
+    signals: int = 0
+    checks: int = 0
+    cases: int = 0
+    settled: int = 0
+    divergent_cases: int = 0
+    divergences: List[Divergence] = field(default_factory=list)
+    truncated: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.divergent_cases == 0
+
+    def merge(self, other: "ReplayReport", max_divergences: int) -> None:
+        self.events += other.events
+        self.signals += other.signals
+        self.checks += other.checks
+        self.cases += other.cases
+        self.settled += other.settled
+        self.divergent_cases += other.divergent_cases
+        self.divergences.extend(other.divergences[:max(0, max_divergences - len(self.divergences))])
+        self.truncated.extend(p for p in other.truncated if p not in self.truncated)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "events": self.events,
+            "signals": self.signals,
+            "checks": self.checks,
+            "cases": self.cases,
+            "settled": self.settled,
+            "divergent_cases": self.divergent_cases,
+            "truncated": list(self.truncated),
+            "seconds": round(self.seconds, 3),
+        }
+
+
+# --- Readers ---------------------------------------------------------------
+
+
+def _owner(raw: Optional[bytes], case_id: Optional[str], shards: int) -> int:
+    # Same placement as shard_for, computed on the raw JSON bytes when the
+    # id has no escapes, so other shards' records are skipped undecoded.
+    if raw is not None:
+        return zlib.crc32(raw) % shards
+    return shard_for(case_id, shards)
+
+
+def _raw_id(data: bytes, start: int) -> Optional[bytes]:
+    end = data.find(b'"', start)
+    if end < 0:
+        return None
+    raw = data[start:end]
+    return None if b"\\" in raw else raw
+
+
+def _generations(names: Sequence[str], prefix: str) -> List[int]:
+    return sorted(
+        int(n.split(".")[1]) for n in names if n.startswith(prefix + ".") and not n.endswith(".tmp")
+    )
+
+
+def _log_events(directory: str, shard: int, shards: int, truncated: List[str]) -> Iterator[Event]:
+    names = os.listdir(directory)
+    snapshots = _generations(names, "snapshot")
+    snap_gen = snapshots[-1] if snapshots else -1
+    paths = [os.path.join(directory, f"snapshot.{snap_gen:08d}.bin")] if snapshots else []
+    paths += [os.path.join(directory, f"events.{g:08d}.log") for g in _generations(names, "events") if g > snap_gen]
+
+    for path in paths:
+        with open(path, "rb") as f:
+            if f.seek(0, 2) == 0:
+                continue
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Framing is inlined: every worker walks every frame, so this
+                # loop is the per-worker floor. A torn or corrupt frame ends the
+                # file, as in EventLogStore recovery.
+                pos, size, i = 0, len(mm), -1
+                unpack, header, crc32 = _FRAME.unpack_from, _FRAME.size, zlib.crc32
+                while pos + header <= size:
+                    length, crc, kind = unpack(mm, pos)
+                    start = pos + header
+                    payload = mm[start:start + length]
+                    if len(payload) < length or crc32(payload) != crc:
+                        break
+                    pos = start + length
+                    i += 1
+                    # Payloads are JSON arrays starting with the case_id.
+                    raw = payload[2:payload.find(b'"', 2)]
+                    if b"\\" in raw:
+                        fields = _scan_json(payload.decode("utf-8"), 0)[0]
+                        if shard_for(fields[0], shards) != shard:
+                            continue
+                    elif crc32(raw) % shards != shard:
+                        continue
+                    else:
+                        fields = _scan_json(payload.decode("utf-8"), 0)[0]
+
+                    case_id, where = fields[0], (path, i)
+                    if kind == _EV_SIGNAL:
+                        yield case_id, _SIGNAL, fields[1:], where
+                    elif kind in (_EV_PUT, _EV_TRANSITION):
+                        yield case_id, _CHECK, [fields[1], fields[2], fields[4], fields[5]], where
+                    elif kind in (_SNAP_CASE, _EV_REPLACE):
+                        if kind == _EV_REPLACE:
+                            yield case_id, _RESET, None, where
+                        for sig in fields[6]:
+                            yield case_id, _SIGNAL, sig, where
+                        yield case_id, _CHECK, [fields[1], fields[2], fields[4], fields[5]], where
+                if pos != size:
+                    truncated.append(path)
+
+
+def _trace_events(record: Dict[str, Any], where: Tuple[str, int]) -> Iterator[Event]:
+    case_id = record["case_id"]
+    for s in record["signals"]:
+        if s.get("source") is None or s.get("outcome") is None:
+            # Traces written before case_trace recorded signal contents.
+            yield case_id, _BROKEN, "trace has no signal source/outcome", where
+            return
+        yield case_id, _SIGNAL, [
+            s["signal_id"], s["source"], s["outcome"], s.get("confidence", 1.0),
+            s.get("received_at") or 0.0, s.get("meta"),
+        ], where
+    # case_trace stores str(case.state), i.e. "CaseState.SETTLED".
+    state = str(record["state"]).rsplit(".", 1)[-1]
+    yield case_id, _CHECK, [
+        state, record.get("final_outcome"), record.get("settlement_id"), record.get("reconciliation_reason"),
+    ], where
+
+
+def _trace_file_events(path: str, shard: int, shards: int) -> Iterator[Event]:
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            record = json.load(f)
+        if shard_for(record["case_id"], shards) == shard:
+            yield from _trace_events(record, (path, 0))
+        return
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        for i, line in enumerate(f):
+            at = line.find(b'"case_id":"')
+            if at < 0:
+                continue
+            raw = _raw_id(line, at + 11)
+            record = None if raw is not None else json.loads(line)
+            if _owner(raw, record and record["case_id"], shards) != shard:
+                continue
+            record = record or json.loads(line)
+            if record.get("kind", "trace") == "trace":
+                yield from _trace_events(record, (path, i))
+
+
+def _is_event_log(directory: str) -> bool:
+    return any(n.startswith(("events.", "snapshot.")) for n in os.listdir(directory))
+
+
+def iter_recorded_events(
+    paths: Sequence[str],
+    shard: int = 0,
+    shards: int = 1,
+    truncated: Optional[List[str]] = None,
+) -> Iterator[Event]:
+    """
+    Yields this shard's (case_id, kind, fields, where) events from `paths`
+    in recorded order. Each path is an EventLogStore directory, a directory
+    of traces, or a trace file (.json, .ndjson, .ndjson.gz).
+    """
+    truncated = truncated if truncated is not None else []
+    for path in paths:
+        if os.path.isdir(path) and _is_event_log(path):
+            yield from _log_events(path, shard, shards, truncated)
+        elif os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith((".json", ".ndjson", ".ndjson.gz")):
+                    yield from _trace_file_events(os.path.join(path, name), shard, shards)
+        else:
+            yield from _trace_file_events(path, shard, shards)
+
+
+# --- Replay ----------------------------------------------------------------
+
+
+class _ShardReplay:
+    """
+    Re-runs one shard's events through ingest_signal / resolve_reconciliation /
+    attempt_settlement on fresh cases. A check first applies the decision it
+    records (a recorded FINAL resolves to the recorded final_outcome, a
+    recorded SETTLED settles), then compares the replayed case with it.
+
+    Once a case is FINAL or SETTLED, ingest can no longer change the fields
+    that are compared, so the case is dropped and only those fields are kept:
+    memory is bounded by the cases still open, not by the signal count.
+    Replay of a case stops at its first divergence.
+    """
+
+    def __init__(self, id_namespace: Optional[str], max_divergences: int) -> None:
+        self.ids = ContentIds(id_namespace or "settlement")
+        self.compare_ids = id_namespace is not None
+        self.max_divergences = max_divergences
+        self.report = ReplayReport()
+        self.cases: Dict[str, Case] = {}
+        # case_id -> (state, final_outcome, settlement_id, reconciliation_reason)
+        self.finalized: Dict[str, Tuple[CaseState, Optional[str], Optional[str], Optional[str]]] = {}
+        self.divergent: Set[str] = set()
+
+    def _diverge(self, case_id: str, name: str, recorded: Any, replayed: Any, where: Tuple[str, int]) -> None:
+        self.divergent.add(case_id)
+        self.cases.pop(case_id, None)
+        self.finalized.pop(case_id, None)
+        report = self.report
+        report.divergent_cases += 1
+        if len(report.divergences) < self.max_divergences:
+            report.divergences.append(Divergence(case_id, name, recorded, replayed, f"{where[0]}#{where[1]}"))
+
+    def run(self, events: Iterator[Event]) -> ReplayReport:
+        report = self.report
+        cases, finalized, divergent = self.cases, self.finalized, self.divergent
+        for case_id, kind, fields, where in events:
+            report.events += 1
+            if case_id in divergent:
+                continue
+            if kind == _SIGNAL:
+                report.signals += 1
+                if case_id in finalized:
+                    continue
+                case = cases.get(case_id)
+                if case is None:
+                    case = cases[case_id] = Case(case_id=case_id)
+                signal_id, source, outcome, confidence, received_at, meta = fields
+                ingest_signal(case, OutcomeSignal(case_id, source, outcome, confidence, received_at, signal_id, meta or {}))
+            elif kind == _CHECK:
+                report.checks += 1
+                self._check(case_id, fields, where)
+            elif kind == _RESET:
+                cases.pop(case_id, None)
+                finalized.pop(case_id, None)
+            else:
+                self._diverge(case_id, "unreplayable", fields, None, where)
+        report.cases = len(cases) + len(finalized) + len(divergent)
+        return report
+
+    def _check(self, case_id: str, fields: list, where: Tuple[str, int]) -> None:
+        state = _STATE_BY_VALUE.get(fields[0])
+        if state is None:
+            self._diverge(case_id, "unreplayable", f"unknown state {fields[0]!r}", None, where)
+            return
+        final_outcome, settlement_id, reason = fields[1], fields[2], fields[3]
+
+        done = self.finalized.get(case_id)
+        if done is not None:
+            case = Case(case_id=case_id, state=done[0], final_outcome=done[1],
+                        settlement_id=done[2], reconciliation_reason=done[3])
+        else:
+            case = self.cases.get(case_id)
+            if case is None:
+                case = self.cases[case_id] = Case(case_id=case_id)
+
+        try:
+            if state in _FINALIZED and case.state in (CaseState.RESOLVED_PROVISIONAL, CaseState.IN_RECONCILIATION):
+                resolve_reconciliation(case, chosen_outcome=final_outcome)
+            if state == CaseState.SETTLED and case.state == CaseState.FINAL:
+                attempt_settlement(case, self.ids)
+                self.report.settled += 1
+        except (ValueError, InvalidTransition, SettlementError) as e:
+            self._diverge(case_id, "error", state.value, f"{type(e).__name__}: {e}", where)
+            return
+
+        for name, recorded, replayed in (
+            ("state", state, case.state),
+            ("final_outcome", final_outcome, case.final_outcome),
+            ("reconciliation_reason", reason, case.reconciliation_reason),
+        ):
+            if recorded != replayed:
+                self._diverge(case_id, name, recorded, replayed, where)
+                return
+        if self.compare_ids and settlement_id != case.settlement_id:
+            self._diverge(case_id, "settlement_id", settlement_id, case.settlement_id, where)
+            return
+
+        if case.state in _FINALIZED:
+            self.cases.pop(case_id, None)
+            self.finalized[case_id] = (case.state, case.final_outcome, case.settlement_id, case.reconciliation_reason)
+
+
+def replay_shard(
+    paths: Sequence[str],
+    shard: int = 0,
+    shards: int = 1,
+    id_namespace: Optional[str] = "settlement",
+    max_divergences: int = 1000,
+) -> ReplayReport:
+    """Replays and verifies the cases of `paths` that shard_for assigns to `shard`."""
+    t0 = time.perf_counter()
+    truncated: List[str] = []
+    report = _ShardReplay(id_namespace, max_divergences).run(iter_recorded_events(paths, shard, shards, truncated))
+    report.truncated = truncated
+    report.seconds = time.perf_counter() - t0
+    return report
+
+
+def _worker(args: tuple, conn) -> None:
+    try:
+        conn.send(replay_shard(*args))
+    except BaseException as e:  # re-raised in the parent
+        conn.send(e)
+    conn.close()
+
+
+def replay(
+    paths: Sequence[str],
+    workers: Optional[int] = None,
+    id_namespace: Optional[str] = "settlement",
+    max_divergences: int = 1000,
+) -> ReplayReport:
+    """
+    Re-runs recorded histories from scratch and reports where they diverge.
+
+    Cases are partitioned by shard_for(case_id) over `workers` processes
+    (default: one per CPU). Every worker scans all inputs but decodes and
+    replays only its own cases, so a case's events keep their recorded order
+    and no state is shared between workers.
+
+    Settlement ids are re-minted with ContentIds(id_namespace) and compared
+    with the recorded ones; pass id_namespace=None for histories settled
+    with random or time-based ids (then only presence via state is checked).
+
+        report = replay(["data/events"], workers=16)
+        if not report.ok:
+            for d in report.divergences: ...
+    """
+    workers = workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    paths = list(paths)
+    if workers == 1:
+        report = replay_shard(paths, 0, 1, id_namespace, max_divergences)
+    else:
+        ctx = mp.get_context("spawn")
+        conns, procs = [], []
+        for shard in range(workers):
+            parent, child = ctx.Pipe(duplex=False)
+            proc = ctx.Process(target=_worker, args=((paths, shard, workers, id_namespace, max_divergences), child))
+            proc.start()
+            child.close()
+            conns.append(parent)
+            procs.append(proc)
+        results = []
+        for shard, conn in enumerate(conns):
+            try:
+                results.append(conn.recv())
+            except EOFError:
+                raise RuntimeError(f"replay worker for shard {shard} exited without a report") from None
+        for proc in procs:
+            proc.join()
+        report = ReplayReport()
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+            report.merge(result, max_divergences)
+    report.seconds = time.perf_counter() - t0
+    return report
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import math
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from .models import Case, CaseState, OutcomeSignal
+from .reconciliation import resolve_reconciliation
+from . import events
+
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel for large numbers of keyed deadlines.
+
+    Level 0 has slots[0] slots of one tick each; each slot of level L spans
+    slots[0] * ... * slots[L-1] ticks. A timer sits in the coarsest level
+    that can still tell it apart from "now" and is cascaded one level down
+    when its slot comes up, so schedule / cancel are O(1) and each timer is
+    moved at most once per level. Slots are dicts keyed by timer key, so a
+    reschedule replaces the old entry instead of leaving a tombstone.
+
+    Time comes from `clock` (seconds) and is quantized to `tick` seconds;
+    timers never fire early. advance() fires everything due up to now.
+
+        wheel = TimerWheel(tick=0.1)
+        wheel.schedule("case_1", time.monotonic() + 30, on_due)
+        wheel.advance()   # call periodically; on_due("case_1") once due
+    """
+
+    def __init__(
+        self,
+        tick: float = 0.1,
+        slots: Sequence[int] = (256, 64, 64, 64),
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if tick <= 0 or not slots or min(slots) < 2:
+            raise ValueError("tick must be positive and every level needs >= 2 slots")
+        self.tick = tick
+        self.clock = clock
+        self._origin = clock()
+        self._now = 0  # current tick
+        self._slots = list(slots)
+        # Ticks covered by one slot of each level, plus the whole wheel.
+        self._span = [1]
+        for n in self._slots:
+            self._span.append(self._span[-1] * n)
+        self._wheels: List[List[Dict[Hashable, int]]] = [[{} for _ in range(n)] for n in self._slots]
+        self._due: Dict[Hashable, int] = {}
+        self._where: Dict[Hashable, Optional[Dict[Hashable, int]]] = {}
+        self._callbacks: Dict[Hashable, Callable[[Hashable], Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._callbacks)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._callbacks
+
+    def _tick_for(self, when: float) -> int:
+        return math.ceil((when - self._origin) / self.tick - 1e-9)
+
+    def _place(self, key: Hashable, deadline: int) -> None:
+        delta = deadline - self._now
+        if delta <= 0:
+            slot = self._due
+        else:
+            level = 0
+            last = len(self._slots) - 1
+            while level < last and delta >= self._span[level + 1]:
+                level += 1
+            # Past the top level, park in the top level; cascading re-places it.
+            slot = self._wheels[level][(deadline // self._span[level]) % self._slots[level]]
+        slot[key] = deadline
+        self._where[key] = slot
+
+    def schedule(self, key: Hashable, when: float, callback: Callable[[Hashable], Any]) -> None:
+        """(Re)schedules `key` to call callback(key) at clock time `when`."""
+        old = self._where.get(key)
+        if old is not None:
+            del old[key]
+        self._callbacks[key] = callback
+        self._place(key, self._tick_for(when))
+
+    def cancel(self, key: Hashable) -> bool:
+        slot = self._where.pop(key, None)
+        if slot is None:
+            return False
+        del slot[key]
+        del self._callbacks[key]
+        return True
+
+    def _fire(self, slot: Dict[Hashable, int]) -> int:
+        fired = 0
+        while slot:
+            key, _ = slot.popitem()
+            del self._where[key]
+            callback = self._callbacks.pop(key)
+            callback(key)
+            fired += 1
+        return fired
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """Fires every timer due at or before `now` (default clock()); returns how many fired."""
+        target = math.floor(((self.clock() if now is None else now) - self._origin) / self.tick + 1e-9)
+        fired = self._fire(self._due)
+        while self._now < target:
+            if not self._callbacks:
+                self._now = target  # nothing pending: skip the idle ticks
+                break
+            self._now += 1
+            t = self._now
+            for level in range(len(self._slots) - 1, 0, -1):
+                if t % self._span[level] == 0:
+                    slot = self._wheels[level][(t // self._span[level]) % self._slots[level]]
+                    entries = list(slot.items())
+                    slot.clear()
+                    for key, deadline in entries:
+                        self._place(key, deadline)
+            fired += self._fire(self._wheels[0][t % self._slots[0]])
+            # Callbacks may schedule timers that are already due.
+            fired += self._fire(self._due)
+        return fired
+
+
+class CaseDeadlines:
+    """
+    Quiet-period finalization and reconciliation timeouts, driven by a TimerWheel.
+
+    - A case entering RESOLVED_PROVISIONAL gets a finalize deadline
+      `quiet_period` seconds out; every further signal on it resets the
+      deadline. When it fires on a case that is still provisional,
+      on_finalize(case) runs (default: resolve_reconciliation to the one
+      outcome seen).
+    - A case entering IN_RECONCILIATION gets an escalate deadline
+      `reconciliation_timeout` seconds out (not reset by signals). When it
+      fires on a case still in reconciliation, on_escalate(case) runs.
+    - Reaching FINAL or SETTLED cancels the case's deadline.
+
+    Deadlines attach through the events listeners, so they follow every
+    case moved by set_state / ingest_signal while this object is open.
+    Call poll() periodically (or from the clock owner in tests) to fire due
+    callbacks, and close() to detach (or use it as a context manager).
+    """
+
+    def __init__(
+        self,
+        quiet_period: float,
+        reconciliation_timeout: float,
+        on_finalize: Optional[Callable[[Case], None]] = None,
+        on_escalate: Optional[Callable[[Case], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        tick: Optional[float] = None,
+    ) -> None:
+        self.quiet_period = quiet_period
+        self.reconciliation_timeout = reconciliation_timeout
+        self.on_finalize = on_finalize or _finalize_single_outcome
+        self.on_escalate = on_escalate
+        self.clock = clock
+        self.wheel = TimerWheel(tick=tick or min(quiet_period, reconciliation_timeout) / 64, clock=clock)
+        self.finalized = 0
+        self.escalated = 0
+        # case_id -> (case, state the pending deadline belongs to)
+        self._pending: Dict[str, Tuple[Case, CaseState]] = {}
+        events.add_transition_listener(self._on_transition)
+        events.add_signal_listener(self._on_signal)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def deadline_state(self, case_id: str) -> Optional[CaseState]:
+        entry = self._pending.get(case_id)
+        return entry[1] if entry is not None else None
+
+    def poll(self, now: Optional[float] = None) -> int:
+        return self.wheel.advance(now)
+
+    def close(self) -> None:
+        events.remove_transition_listener(self._on_transition)
+        events.remove_signal_listener(self._on_signal)
+
+    def __enter__(self) -> "CaseDeadlines":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _arm(self, case: Case, state: CaseState, delay: float) -> None:
+        self._pending[case.case_id] = (case, state)
+        self.wheel.schedule(case.case_id, self.clock() + delay, self._due)
+
+    def _on_transition(self, case: Case, old: CaseState, new: CaseState) -> None:
+        if new == CaseState.RESOLVED_PROVISIONAL:
+            self._arm(case, new, self.quiet_period)
+        elif new == CaseState.IN_RECONCILIATION:
+            self._arm(case, new, self.reconciliation_timeout)
+        elif self._pending.pop(case.case_id, None) is not None:
+            self.wheel.cancel(case.case_id)
+
+    def _on_signal(self, case: Case, sig: OutcomeSignal) -> None:
+        entry = self._pending.get(case.case_id)
+        if entry is not None and entry[1] == CaseState.RESOLVED_PROVISIONAL and case.state == entry[1]:
+            self._arm(case, entry[1], self.quiet_period)
+
+    def _due(self, case_id: Hashable) -> None:
+        entry = self._pending.pop(case_id, None)
+        if entry is None:
+            return
+        case, state = entry
+        if case.state != state:
+            return
+        if state == CaseState.RESOLVED_PROVISIONAL:
+            self.finalized += 1
+            self.on_finalize(case)
+        else:
+            self.escalated += 1
+            if self.on_escalate is not None:
+                self.on_escalate(case)
+
+
+def _finalize_single_outcome(case: Case) -> None:
+    # Provisional cases have seen exactly one outcome.
+    resolve_reconciliation(case, chosen_outcome=next(iter(case.outcome_counts)))
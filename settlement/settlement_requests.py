@@ -1,11 +1,15 @@
 ﻿from __future__ import annotations
 
+import sqlite3
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional, Dict
+from typing import Callable, List, Optional, Sequence, Tuple
 
-from settlement.gate import attempt_settlement, SettlementError
-from settlement.models import Case
+from settlement.gate import attempt_settlement, default_id_generator, SettlementError
+from settlement.ids import SettlementIdGenerator
+from settlement.models import Case, CaseState
+from settlement import metrics
 
 
 @dataclass
@@ -15,6 +19,176 @@ class SettlementRequestResult:
     reason: str
 
 
+class _ClaimedId(SettlementIdGenerator):
+    """Hands the gate the settlement_id already claimed for the case in the backend."""
+
+    def __init__(self, settlement_id: str) -> None:
+        self.settlement_id = settlement_id
+
+    def many(self, cases: Sequence[Case]) -> List[str]:
+        return [self.settlement_id for _ in cases]
+
+
+class RequestBackend:
+    """
+    Storage for the request-id dedup map used by SettlementRequestRegistry.
+
+    Both writes are insert-if-absent and return the value that ended up
+    stored, so concurrent writers always converge on a single answer.
+    """
+
+    def get(self, request_id: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def put_if_absent(self, request_id: str, settlement_id: str) -> str:
+        """Stores request_id -> settlement_id unless present; returns the stored settlement_id."""
+        raise NotImplementedError
+
+    def claim_case(self, case_id: str, settlement_id: str) -> str:
+        """Records the settlement_id for a case unless one exists; returns the winning settlement_id."""
+        raise NotImplementedError
+
+
+class InMemoryRequestBackend(RequestBackend):
+    """
+    Single-process backend.
+
+    The map is bounded: entries older than `retention_seconds` or beyond
+    `max_entries` are evicted oldest-first (None disables either bound).
+    Within one process the Case object itself is the source of truth for
+    its settlement_id, so claim_case keeps no state.
+    """
+
+    def __init__(
+        self,
+        retention_seconds: Optional[float] = 24 * 3600.0,
+        max_entries: Optional[int] = 1_000_000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.retention_seconds = retention_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        # request_id -> (settlement_id, created_at), kept in insertion (= time) order
+        self._requests: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self.evicted_expired = 0
+        self.evicted_capacity = 0
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def _expire(self, now: float) -> None:
+        if self.retention_seconds is None:
+            return
+        cutoff = now - self.retention_seconds
+        requests = self._requests
+        while requests:
+            oldest = next(iter(requests.values()))
+            if oldest[1] > cutoff:
+                break
+            requests.popitem(last=False)
+            self.evicted_expired += 1
+
+    def get(self, request_id: str) -> Optional[str]:
+        self._expire(self._clock())
+        cached = self._requests.get(request_id)
+        return cached[0] if cached is not None else None
+
+    def put_if_absent(self, request_id: str, settlement_id: str) -> str:
+        cached = self._requests.get(request_id)
+        if cached is not None:
+            return cached[0]
+        self._requests[request_id] = (settlement_id, self._clock())
+        if self.max_entries is not None:
+            while len(self._requests) > self.max_entries:
+                self._requests.popitem(last=False)
+                self.evicted_capacity += 1
+        return settlement_id
+
+    def claim_case(self, case_id: str, settlement_id: str) -> str:
+        return settlement_id
+
+
+class SQLiteRequestBackend(RequestBackend):
+    """
+    Backend shared by many processes on one host through a SQLite file.
+
+    Inserts are INSERT OR IGNORE followed by a read of the stored row, so the
+    first writer wins and every process reads the same answer. claim_case
+    records one settlement_id per case_id, which keeps settlement exactly-once
+    even when several processes hold their own copy of the same FINAL case.
+    Rows older than `retention_seconds` are purged every `purge_every` inserts
+    via an index on created_at.
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS settlement_requests (
+        request_id    TEXT PRIMARY KEY,
+        settlement_id TEXT NOT NULL,
+        created_at    REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_settlement_requests_created_at ON settlement_requests (created_at);
+    CREATE TABLE IF NOT EXISTS case_settlements (
+        case_id       TEXT PRIMARY KEY,
+        settlement_id TEXT NOT NULL,
+        created_at    REAL NOT NULL
+    );
+    """
+
+    def __init__(
+        self,
+        path: str,
+        retention_seconds: Optional[float] = 24 * 3600.0,
+        purge_every: int = 10_000,
+        busy_timeout_ms: int = 30_000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.retention_seconds = retention_seconds
+        self.purge_every = purge_every
+        self._clock = clock
+        self._inserts = 0
+        self._conn = sqlite3.connect(path, isolation_level=None, timeout=busy_timeout_ms / 1000.0)
+        self._conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._SCHEMA)
+
+    def get(self, request_id: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT settlement_id FROM settlement_requests WHERE request_id = ?", (request_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def put_if_absent(self, request_id: str, settlement_id: str) -> str:
+        now = self._clock()
+        self._conn.execute(
+            "INSERT OR IGNORE INTO settlement_requests (request_id, settlement_id, created_at) VALUES (?, ?, ?)",
+            (request_id, settlement_id, now),
+        )
+        self._inserts += 1
+        if self.retention_seconds is not None and self._inserts % self.purge_every == 0:
+            self.purge(now - self.retention_seconds)
+        return self.get(request_id) or settlement_id
+
+    def claim_case(self, case_id: str, settlement_id: str) -> str:
+        self._conn.execute(
+            "INSERT OR IGNORE INTO case_settlements (case_id, settlement_id, created_at) VALUES (?, ?, ?)",
+            (case_id, settlement_id, self._clock()),
+        )
+        row = self._conn.execute(
+            "SELECT settlement_id FROM case_settlements WHERE case_id = ?", (case_id,)
+        ).fetchone()
+        return row[0]
+
+    def purge(self, older_than: float) -> int:
+        """Deletes request ids created before `older_than`; returns the number removed."""
+        cur = self._conn.execute("DELETE FROM settlement_requests WHERE created_at < ?", (older_than,))
+        return cur.rowcount
+
+    def close(self) -> None:
+        self._conn.close()
+
+
 class SettlementRequestRegistry:
     """
     Minimal request-id (nonce) dedup layer.
@@ -22,35 +196,60 @@ class SettlementRequestRegistry:
     - First time a request_id is seen for a FINAL case, it attempts settlement.
     - Re-using the same request_id returns the same settlement_id (dedup).
     - A different request_id after settlement returns the existing settlement_id.
-    - Uses simple in-memory map (for demo); can be persisted using SQLiteStore later.
+    - The request_id map lives in a pluggable RequestBackend: in-memory and
+      bounded by default, or SQLiteRequestBackend to share it across processes.
+
+    A replay of an evicted request_id still dedups correctly, because the
+    case's own settlement_id is consulted before the gate is attempted.
     """
 
-    def __init__(self) -> None:
-        # request_id -> settlement_id
-        self._requests: Dict[str, str] = {}
-        self._created_at: Dict[str, float] = {}
+    def __init__(
+        self,
+        retention_seconds: Optional[float] = 24 * 3600.0,
+        max_entries: Optional[int] = 1_000_000,
+        clock: Callable[[], float] = time.time,
+        backend: Optional[RequestBackend] = None,
+    ) -> None:
+        self.backend = backend or InMemoryRequestBackend(retention_seconds, max_entries, clock)
 
     def submit(self, case: Case, request_id: str) -> SettlementRequestResult:
+        if not metrics.enabled:
+            return self._submit(case, request_id)
+        t0 = metrics.perf_counter_ns()
+        result = self._submit(case, request_id)
+        metrics.record("submit", t0, result.reason)
+        return result
+
+    def _submit(self, case: Case, request_id: str) -> SettlementRequestResult:
         if not request_id or not request_id.strip():
             return SettlementRequestResult(False, None, "missing_request_id")
 
         # If we've seen this exact request before, return cached result.
-        if request_id in self._requests:
-            return SettlementRequestResult(True, self._requests[request_id], "dedup_same_request_id")
-
-        # If already settled, return existing settlement id (dedup across request ids).
-        if getattr(case, "settlement_id", None):
-            sid = case.settlement_id
-            self._requests[request_id] = sid
-            self._created_at[request_id] = time.time()
+        cached = self.backend.get(request_id)
+        if cached is not None:
+            return SettlementRequestResult(True, cached, "dedup_same_request_id")
+
+        # If already settled, return existing settlement id (dedup across request ids,
+        # and the fallback for request_ids that have been evicted).
+        if case.state == CaseState.SETTLED and case.settlement_id:
+            sid = self.backend.put_if_absent(request_id, case.settlement_id)
             return SettlementRequestResult(True, sid, "already_settled")
 
-        # Otherwise attempt settlement through the existing gate.
+        # Otherwise attempt settlement through the existing gate. The id is
+        # claimed in the backend first: another process may have settled its
+        # copy of this case already, and then this copy settles with the
+        # winning id, so listeners (stores, journals) never see a discarded one.
+        candidate = claimed = None
+        if case.state == CaseState.FINAL:
+            candidate = case.settlement_id or default_id_generator()(case)
+            claimed = self.backend.claim_case(case.case_id, candidate)
+            if case.settlement_id != claimed:
+                # Still FINAL: an id left by an interrupted settle_many loses to the claim.
+                case.settlement_id = None
         try:
-            sid = attempt_settlement(case)
+            sid = attempt_settlement(case, _ClaimedId(claimed) if claimed else None)
         except SettlementError as e:
             return SettlementRequestResult(False, None, f"settlement_blocked:{e}")
 
-        self._requests[request_id] = sid
-        self._created_at[request_id] = time.time()
-        return SettlementRequestResult(True, sid, "settled")
+        sid = self.backend.put_if_absent(request_id, sid)
+        return SettlementRequestResult(True, sid, "settled" if claimed == candidate else "already_settled")
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .gate import attempt_settlement, SettlementError
+from .models import Case, OutcomeSignal
+from .reconciliation import ingest_signal, resolve_reconciliation
+from .state_machine import InvalidTransition
+from .store import InMemoryStore
+
+
+def shard_for(case_id: str, shards: int) -> int:
+    # crc32 rather than hash(): str hashes are salted per process.
+    return zlib.crc32(case_id.encode("utf-8")) % shards
+
+
+def _error(e: BaseException) -> str:
+    return f"error:{type(e).__name__}: {e}"
+
+
+class _BatchFailed:
+    """Sent instead of a result list when a whole batch could not be handled."""
+
+    def __init__(self, reason: str) -> None:
+        self.reason = reason
+
+
+def _shard_main(conn) -> None:
+    """
+    Worker loop: owns one InMemoryStore and applies batches of commands to it.
+    An item that raises gets an "error:..." result; a batch that cannot be
+    received or answered at all is reported as _BatchFailed. The loop only
+    ends on "stop" or when the front end goes away.
+    """
+    store = InMemoryStore()
+
+    def case_for(case_id: str) -> Case:
+        case = store.get_case(case_id)
+        if case is None:
+            case = Case(case_id=case_id)
+            store.put_case(case)
+        return case
+
+    while True:
+        try:
+            op, items = conn.recv()
+        except EOFError:
+            return
+        except Exception as e:  # e.g. an item that cannot be unpickled here
+            conn.send(_BatchFailed(_error(e)))
+            continue
+        if op == "stop":
+            conn.close()
+            return
+        out: List[Any] = []
+        try:
+            if op == "ingest":
+                for sig in items:
+                    try:
+                        out.append(ingest_signal(case_for(sig.case_id), sig))
+                    except Exception as e:
+                        out.append((False, _error(e)))
+            elif op == "resolve":
+                for case_id, outcome in items:
+                    case = store.get_case(case_id)
+                    if case is None:
+                        out.append((False, "unknown_case"))
+                        continue
+                    try:
+                        resolve_reconciliation(case, chosen_outcome=outcome)
+                        out.append((True, "final"))
+                    except (ValueError, InvalidTransition) as e:
+                        out.append((False, str(e)))
+                    except Exception as e:
+                        out.append((False, _error(e)))
+            elif op == "settle":
+                for case_id in items:
+                    case = store.get_case(case_id)
+                    if case is None:
+                        out.append((None, "unknown_case"))
+                        continue
+                    try:
+                        out.append((attempt_settlement(case), "settled"))
+                    except SettlementError as e:
+                        out.append((None, f"settlement_blocked:{e}"))
+                    except Exception as e:
+                        out.append((None, _error(e)))
+            elif op == "get":
+                out = [store.get_case(case_id) for case_id in items]
+            elif op == "count":
+                out = [len(store.cases)]
+            else:
+                raise ValueError(f"unknown op {op!r}")
+        except Exception as e:  # malformed batch, e.g. an item that is not a pair
+            out = _BatchFailed(_error(e))
+        try:
+            conn.send(out)
+        except Exception as e:  # a result that cannot be pickled
+            conn.send(_BatchFailed(_error(e)))
+
+
+class ShardedEngine:
+    """
+    Runs the control plane across N worker processes partitioned by case_id.
+
+    Each shard process owns the cases that hash to it and applies
+    ingest_signal / resolve_reconciliation / attempt_settlement locally, so
+    no locks are shared between shards. The front-end methods accept
+    batches, fan them out to all shards at once and return results in input
+    order; single-item calls work but pay one IPC round trip each. An item
+    that raises in its shard comes back as an "error:<type>: <message>"
+    result (for every item of the batch if the batch itself could not be
+    received) and the shard keeps running.
+
+        with ShardedEngine(shards=8) as engine:
+            engine.ingest(signals)
+            engine.resolve([(case_id, "YES"), ...])
+            engine.settle([case_id, ...])
+    """
+
+    def __init__(self, shards: Optional[int] = None, chunk_size: int = 4096) -> None:
+        self.shards = shards or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._conns = []
+        self._procs = []
+        for _ in range(self.shards):
+            parent, child = mp.Pipe()
+            proc = mp.Process(target=_shard_main, args=(child,), daemon=True)
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+
+    def _scatter(self, op: str, items: Iterable[Any], key) -> List[Any]:
+        results: List[Any] = []
+        batch: List[Any] = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= self.chunk_size * self.shards:
+                results.extend(self._run_batch(op, batch, key))
+                batch = []
+        if batch:
+            results.extend(self._run_batch(op, batch, key))
+        return results
+
+    def _run_batch(self, op: str, batch: Sequence[Any], key) -> List[Any]:
+        parts: Dict[int, List[Any]] = {}
+        positions: Dict[int, List[int]] = {}
+        for i, item in enumerate(batch):
+            shard = shard_for(key(item), self.shards)
+            parts.setdefault(shard, []).append(item)
+            positions.setdefault(shard, []).append(i)
+        # Send to every shard before waiting on any, so shards work in parallel.
+        for shard, items in parts.items():
+            try:
+                self._conns[shard].send((op, items))
+            except OSError:
+                raise RuntimeError(f"shard {shard} worker exited") from None
+        results: List[Any] = [None] * len(batch)
+        for shard in parts:
+            out = self._recv(shard)
+            if isinstance(out, _BatchFailed):
+                failed = (None if op == "settle" else False, out.reason)
+                out = [None if op == "get" else failed] * len(positions[shard])
+            for i, r in zip(positions[shard], out):
+                results[i] = r
+        return results
+
+    def _recv(self, shard: int) -> Any:
+        try:
+            return self._conns[shard].recv()
+        except EOFError:
+            raise RuntimeError(f"shard {shard} worker exited") from None
+
+    def ingest(self, signals: Iterable[OutcomeSignal]) -> List[Tuple[bool, str]]:
+        return self._scatter("ingest", signals, lambda s: s.case_id)
+
+    def resolve(self, decisions: Iterable[Tuple[str, str]]) -> List[Tuple[bool, str]]:
+        """decisions: (case_id, chosen_outcome) pairs."""
+        return self._scatter("resolve", decisions, lambda d: d[0])
+
+    def settle(self, case_ids: Iterable[str]) -> List[Tuple[Optional[str], str]]:
+        """Returns (settlement_id or None, reason) per case_id."""
+        return self._scatter("settle", case_ids, lambda c: c)
+
+    def get_case(self, case_id: str) -> Optional[Case]:
+        """Returns a snapshot copy of the case from its owning shard."""
+        return self._run_batch("get", [case_id], lambda c: c)[0]
+
+    def case_count(self) -> int:
+        total = 0
+        for conn in self._conns:
+            conn.send(("count", None))
+        for shard in range(self.shards):
+            total += self._recv(shard)[0]
+        return total
+
+    def close(self) -> None:
+        for conn in self._conns:
+            try:
+                conn.send(("stop", None))
+            except OSError:  # the worker has already exited
+                pass
+            conn.close()
+        for proc in self._procs:
+            proc.join()
+        self._conns.clear()
+        self._procs.clear()
+
+    def __enter__(self) -> "ShardedEngine":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -1,21 +1,92 @@
 from __future__ import annotations
+from typing import Dict, FrozenSet, Iterable, List
 from .models import Case, CaseState
+from .events import transition_listeners
+from . import metrics
 
 
 class InvalidTransition(Exception):
     pass
 
 
+# Deterministic transitions only
+ALLOWED_TRANSITIONS: Dict[CaseState, FrozenSet[CaseState]] = {
+    CaseState.OPEN: frozenset({CaseState.RESOLVED_PROVISIONAL, CaseState.IN_RECONCILIATION}),
+    CaseState.RESOLVED_PROVISIONAL: frozenset({CaseState.IN_RECONCILIATION, CaseState.FINAL}),
+    CaseState.IN_RECONCILIATION: frozenset({CaseState.FINAL}),  # only exit when resolved
+    CaseState.FINAL: frozenset({CaseState.SETTLED}),
+    CaseState.SETTLED: frozenset(),
+}
+
+# Same table as integer bitmasks: bit i set <=> transition to the i-th state is allowed.
+_STATE_BIT: Dict[CaseState, int] = {s: 1 << i for i, s in enumerate(CaseState)}
+_ALLOWED_MASK: Dict[CaseState, int] = {
+    s: sum(_STATE_BIT[t] for t in targets) for s, targets in ALLOWED_TRANSITIONS.items()
+}
+
+
 def set_state(case: Case, new_state: CaseState) -> None:
-    # Deterministic transitions only
-    allowed = {
-        CaseState.OPEN: {CaseState.RESOLVED_PROVISIONAL, CaseState.IN_RECONCILIATION},
-        CaseState.RESOLVED_PROVISIONAL: {CaseState.IN_RECONCILIATION, CaseState.FINAL},
-        CaseState.IN_RECONCILIATION: {CaseState.FINAL},  # only exit when resolved
-        CaseState.FINAL: {CaseState.SETTLED},
-        CaseState.SETTLED: set(),
-    }
-
-    if new_state not in allowed[case.state]:
+    t0 = metrics.perf_counter_ns() if metrics.enabled else 0
+    if not _ALLOWED_MASK[case.state] & _STATE_BIT[new_state]:
+        if t0:
+            metrics.record("set_state", t0, "invalid_transition")
         raise InvalidTransition(f"{case.state} -> {new_state} not allowed")
+    old_state = case.state
     case.state = new_state
+    for fn in transition_listeners:
+        fn(case, old_state, new_state)
+    if t0:
+        metrics.record("set_state", t0, new_state.value)
+
+
+def set_state_many(cases: Iterable[Case], new_state: CaseState, strict: bool = True) -> List[Case]:
+    """
+    Moves every case to new_state.
+    All cases are validated before any is changed. With strict=True an
+    invalid transition raises InvalidTransition and nothing is applied;
+    with strict=False valid cases are applied and the rejected ones returned.
+    A case passed more than once is moved (and reported) once.
+    """
+    t0 = metrics.perf_counter_ns() if metrics.enabled else 0
+    bit = _STATE_BIT[new_state]
+    mask = _ALLOWED_MASK
+    cases = list(cases)
+    rejected = [c for c in cases if not mask[c.state] & bit]
+    if rejected and strict:
+        if t0:
+            metrics.record("set_state_many", t0, "invalid_transition")
+        sample = ", ".join(f"{c.case_id} ({c.state})" for c in rejected[:5])
+        raise InvalidTransition(f"{len(rejected)} case(s) cannot move to {new_state}: {sample}")
+
+    if rejected:
+        rejected = list({id(c): c for c in rejected}.values())
+        skip = set(map(id, rejected))
+        cases = [c for c in cases if id(c) not in skip]
+    if not transition_listeners:
+        # Repeats just store new_state again; no need to dedupe here.
+        for case in cases:
+            case.state = new_state
+        if t0:
+            _record_many(t0, new_state, len(cases), len(rejected))
+        return rejected
+    # Dedupe by identity: a repeated case would otherwise fire an X -> X transition.
+    seen = set()
+    for case in cases:
+        if id(case) in seen:
+            continue
+        seen.add(id(case))
+        old_state = case.state
+        case.state = new_state
+        for fn in transition_listeners:
+            fn(case, old_state, new_state)
+    if t0:
+        _record_many(t0, new_state, len(seen), len(rejected))
+    return rejected
+
+
+def _record_many(t0: int, new_state: CaseState, applied: int, rejected: int) -> None:
+    # One latency sample per batch; counters count cases, as set_state's do.
+    metrics.record("set_state_many", t0)
+    metrics.incr("set_state_many." + new_state.value, applied)
+    if rejected:
+        metrics.incr("set_state_many.invalid_transition", rejected)
@@ -1,7 +1,15 @@
 from __future__ import annotations
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Dict, Optional
-from .models import Case
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import json
+import os
+import sqlite3
+import struct
+import zlib
+from .models import Case, CaseState, OutcomeSignal
+from .reconciliation import restore_signal
+from . import events
 
 
 @dataclass
@@ -13,3 +21,741 @@ class InMemoryStore:
 
     def put_case(self, case: Case) -> None:
         self.cases[case.case_id] = case
+
+
+@dataclass
+class IndexedStore(InMemoryStore):
+    """
+    InMemoryStore with maintained secondary indexes:
+      - state -> case_ids
+      - settlement_id -> case_id
+      - signal source -> case_ids
+    Indexes follow set_state / signal ingest on stored cases through the
+    events listeners, so sweeps (e.g., all IN_RECONCILIATION cases) and
+    payout lookups cost O(result) instead of a scan over every case.
+    Call close() to detach the listeners. Index entries are insertion-ordered
+    dicts used as sets, so sweeps visit cases in a deterministic order.
+    """
+    by_state: Dict[CaseState, Dict[str, None]] = field(default_factory=dict)
+    by_settlement_id: Dict[str, str] = field(default_factory=dict)
+    by_source: Dict[str, Dict[str, None]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        for state in CaseState:
+            self.by_state.setdefault(state, {})
+        initial = list(self.cases.values())
+        self.cases = {}
+        for case in initial:
+            self.put_case(case)
+        events.add_transition_listener(self._on_transition)
+        events.add_signal_listener(self._on_signal)
+
+    def put_case(self, case: Case) -> None:
+        old = self.cases.get(case.case_id)
+        if old is not None:
+            self._unindex(old)
+        self.cases[case.case_id] = case
+        self.by_state[case.state][case.case_id] = None
+        if case.settlement_id:
+            self.by_settlement_id[case.settlement_id] = case.case_id
+        for source in case.signals_by_source or {s.source for s in case.signals.values()}:
+            self.by_source.setdefault(source, {})[case.case_id] = None
+
+    def _unindex(self, case: Case) -> None:
+        self.by_state[case.state].pop(case.case_id, None)
+        if case.settlement_id and self.by_settlement_id.get(case.settlement_id) == case.case_id:
+            del self.by_settlement_id[case.settlement_id]
+        for ids in self.by_source.values():
+            ids.pop(case.case_id, None)
+
+    def _on_transition(self, case: Case, old: CaseState, new: CaseState) -> None:
+        if self.cases.get(case.case_id) is not case:
+            return
+        self.by_state[old].pop(case.case_id, None)
+        self.by_state[new][case.case_id] = None
+        if new == CaseState.SETTLED and case.settlement_id:
+            self.by_settlement_id[case.settlement_id] = case.case_id
+
+    def _on_signal(self, case: Case, sig: OutcomeSignal) -> None:
+        if self.cases.get(case.case_id) is case:
+            self.by_source.setdefault(sig.source, {})[case.case_id] = None
+
+    def case_ids_in_state(self, state: CaseState) -> List[str]:
+        return list(self.by_state[state])
+
+    def cases_in_state(self, state: CaseState) -> List[Case]:
+        return [self.cases[case_id] for case_id in self.by_state[state]]
+
+    def case_for_settlement_id(self, settlement_id: str) -> Optional[Case]:
+        case_id = self.by_settlement_id.get(settlement_id)
+        return self.cases.get(case_id) if case_id is not None else None
+
+    def case_ids_for_source(self, source: str) -> List[str]:
+        return list(self.by_source.get(source, ()))
+
+    def close(self) -> None:
+        events.remove_transition_listener(self._on_transition)
+        events.remove_signal_listener(self._on_signal)
+
+    def __enter__(self) -> "IndexedStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cases (
+    case_id               TEXT PRIMARY KEY,
+    state                 TEXT NOT NULL,
+    final_outcome         TEXT,
+    settled_at            REAL,
+    settlement_id         TEXT,
+    reconciliation_reason TEXT
+);
+CREATE TABLE IF NOT EXISTS signals (
+    seq         INTEGER PRIMARY KEY AUTOINCREMENT,
+    signal_id   TEXT NOT NULL UNIQUE,
+    case_id     TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    outcome     TEXT NOT NULL,
+    confidence  REAL NOT NULL,
+    received_at REAL NOT NULL,
+    meta        TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_signals_case_id ON signals (case_id, seq);
+"""
+
+_UPSERT_CASE = """
+INSERT INTO cases (case_id, state, final_outcome, settled_at, settlement_id, reconciliation_reason)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (case_id) DO UPDATE SET
+    state = excluded.state,
+    final_outcome = excluded.final_outcome,
+    settled_at = excluded.settled_at,
+    settlement_id = excluded.settlement_id,
+    reconciliation_reason = excluded.reconciliation_reason
+"""
+
+_INSERT_SIGNAL = """
+INSERT OR IGNORE INTO signals (signal_id, case_id, source, outcome, confidence, received_at, meta)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SELECT_CASE = """
+SELECT state, final_outcome, settled_at, settlement_id, reconciliation_reason
+FROM cases WHERE case_id = ?
+"""
+
+_SELECT_SIGNALS = """
+SELECT signal_id, source, outcome, confidence, received_at, meta
+FROM signals WHERE case_id = ? ORDER BY seq
+"""
+
+
+class SQLiteStore:
+    """
+    Durable case store backed by SQLite (same interface as InMemoryStore).
+
+    - WAL journaling; cases and signals live in normalized tables indexed by case_id.
+    - Statements are fixed SQL strings, so sqlite3 reuses its prepared statements.
+    - Signals are append-only: put_case only writes signals not yet persisted.
+    - group_commit=N batches N put_case calls into one transaction (one fsync).
+      Call flush() (or close()) to commit a partial batch.
+    - If a put_case or commit fails, the open transaction is rolled back and
+      the error re-raised; put_case calls of that group must be repeated.
+    """
+
+    def __init__(self, path: str, group_commit: int = 1, synchronous: str = "FULL") -> None:
+        if group_commit < 1:
+            raise ValueError("group_commit must be >= 1")
+        self.path = path
+        self.group_commit = group_commit
+        self._conn = sqlite3.connect(path, isolation_level=None, cached_statements=64)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={synchronous}")
+        self._conn.executescript(_SCHEMA)
+        self._pending = 0
+        # case_id -> number of that case's signals already on disk
+        self._persisted_signals: Dict[str, int] = {}
+        # Same, for signals written in the open transaction (merged on commit).
+        self._uncommitted_signals: Dict[str, int] = {}
+
+    def get_case(self, case_id: str) -> Optional[Case]:
+        row = self._conn.execute(_SELECT_CASE, (case_id,)).fetchone()
+        if row is None:
+            return None
+        state, final_outcome, settled_at, settlement_id, reason = row
+        case = Case(
+            case_id=case_id,
+            state=CaseState(state),
+            final_outcome=final_outcome,
+            settled_at=settled_at,
+            settlement_id=settlement_id,
+            reconciliation_reason=reason,
+        )
+        for signal_id, source, outcome, confidence, received_at, meta in self._conn.execute(
+            _SELECT_SIGNALS, (case_id,)
+        ):
+            case.signals[signal_id] = OutcomeSignal(
+                case_id=case_id,
+                source=source,
+                outcome=outcome,
+                confidence=confidence,
+                received_at=received_at,
+                signal_id=signal_id,
+                meta=json.loads(meta) if meta else {},
+            )
+        case.rebuild_indexes()
+        if self._conn.in_transaction:
+            # The read includes rows of the open group; a rollback must forget them.
+            self._uncommitted_signals[case_id] = len(case.signals)
+        else:
+            self._persisted_signals[case_id] = len(case.signals)
+        return case
+
+    def put_case(self, case: Case) -> None:
+        try:
+            self._put_case(case)
+        except BaseException:
+            self._rollback()
+            raise
+        self._pending += 1
+        if self._pending >= self.group_commit:
+            self.flush()
+
+    def _put_case(self, case: Case) -> None:
+        if self._pending == 0:
+            self._conn.execute("BEGIN")
+        self._conn.execute(
+            _UPSERT_CASE,
+            (
+                case.case_id,
+                case.state.value,
+                case.final_outcome,
+                case.settled_at,
+                case.settlement_id,
+                case.reconciliation_reason,
+            ),
+        )
+        done = self._uncommitted_signals.get(case.case_id)
+        if done is None:
+            done = self._persisted_signals.get(case.case_id, 0)
+        if len(case.signals) > done:
+            new = list(case.signals.values())[done:]
+            self._conn.executemany(
+                _INSERT_SIGNAL,
+                [
+                    (
+                        s.signal_id,
+                        case.case_id,
+                        s.source,
+                        s.outcome,
+                        s.confidence,
+                        s.received_at,
+                        json.dumps(s.meta) if s.meta else None,
+                    )
+                    for s in new
+                ],
+            )
+            self._uncommitted_signals[case.case_id] = len(case.signals)
+
+    def flush(self) -> None:
+        """Commits any put_case calls still pending in the current group."""
+        if self._pending:
+            try:
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._rollback()
+                raise
+            self._pending = 0
+            self._persisted_signals.update(self._uncommitted_signals)
+            self._uncommitted_signals.clear()
+
+    def _rollback(self) -> None:
+        if self._conn.in_transaction:
+            self._conn.execute("ROLLBACK")
+        self._pending = 0
+        self._uncommitted_signals.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self) -> "SQLiteStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# Event log framing: <u32 payload length><u32 crc32 of payload><u8 kind> + payload.
+# Payloads are compact JSON arrays; a torn or corrupt tail record ends replay.
+_FRAME = struct.Struct("<IIB")
+
+_EV_PUT = 1         # [case_id, state, final_outcome, settled_at, settlement_id, reconciliation_reason]
+_EV_SIGNAL = 2      # [case_id, signal_id, source, outcome, confidence, received_at, meta]
+_EV_TRANSITION = 3  # same fields as _EV_PUT, captured after set_state
+_SNAP_CASE = 4      # _EV_PUT fields + [signal fields without case_id, ...]
+_EV_REPLACE = 5     # _SNAP_CASE fields: put_case of a new object, replaces the recorded case
+
+_decode_json = json.JSONDecoder().decode
+_STATE_BY_VALUE = {s.value: s for s in CaseState}
+
+
+def _case_fields(case: Case) -> list:
+    return [
+        case.case_id,
+        case.state.value,
+        case.final_outcome,
+        case.settled_at,
+        case.settlement_id,
+        case.reconciliation_reason,
+    ]
+
+
+def _signal_fields(sig: OutcomeSignal) -> list:
+    return [sig.signal_id, sig.source, sig.outcome, sig.confidence, sig.received_at, sig.meta or None]
+
+
+def _snapshot_fields(case: Case) -> list:
+    fields = _case_fields(case)
+    fields.append([_signal_fields(s) for s in case.signals.values()])
+    return fields
+
+
+def _encode(kind: int, fields: list) -> bytes:
+    payload = json.dumps(fields, separators=(",", ":")).encode("utf-8")
+    return _FRAME.pack(len(payload), zlib.crc32(payload), kind) + payload
+
+
+def _read_frames(path: str) -> Iterator[Tuple[int, list, int]]:
+    """Yields (kind, fields, end_offset) for every intact frame in the file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    pos, size = 0, len(data)
+    while pos + _FRAME.size <= size:
+        length, crc, kind = _FRAME.unpack_from(data, pos)
+        start = pos + _FRAME.size
+        payload = data[start:start + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            return
+        pos = start + length
+        yield kind, _decode_json(payload.decode("utf-8")), pos
+
+
+class EventLogStore:
+    """
+    Event-sourced case store (same interface as InMemoryStore).
+
+    Cases live in memory; every put_case, signal ingest and set_state
+    transition on a stored case is appended to a length-prefixed binary log
+    in `directory`. snapshot() (or snapshot_every=N events) writes a compact
+    snapshot of all cases and starts a new log segment, so recovery loads the
+    latest snapshot and replays only the log tail written after it.
+
+    durability: "none" (OS buffered), "flush" (flush each event to the OS,
+    survives process crashes) or "fsync" (fsync each event).
+
+    Signals are encoded by a signal validator before ingest stores them, so
+    a signal that cannot be journaled (e.g. non-JSON meta) is rejected with
+    the case untouched. Journaling is attached to the process-global event
+    lists: close() the store (or use it as a context manager) when done.
+    """
+
+    def __init__(self, directory: str, snapshot_every: int = 0, durability: str = "flush") -> None:
+        if durability not in ("none", "flush", "fsync"):
+            raise ValueError(f"unknown durability mode: {durability}")
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.durability = durability
+        self.cases: Dict[str, Case] = {}
+        self._events_since_snapshot = 0
+        # (signal, frame) encoded by _check_signal for the next _on_signal
+        self._encoded_signal: Optional[Tuple[OutcomeSignal, bytes]] = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._log_gen = self._recover()
+        self._log = open(self._log_path(self._log_gen), "ab")
+
+        events.add_signal_validator(self._check_signal)
+        events.add_transition_listener(self._on_transition)
+        events.add_signal_listener(self._on_signal)
+
+    # --- store interface -------------------------------------------------
+
+    def get_case(self, case_id: str) -> Optional[Case]:
+        return self.cases.get(case_id)
+
+    def put_case(self, case: Case) -> None:
+        if self.cases.get(case.case_id) is not case:
+            # New object: journal it whole, replacing whatever was recorded
+            # under its case_id. Signals ingested into a stored case are
+            # journaled by the listener.
+            frame = _encode(_EV_REPLACE, _snapshot_fields(case))
+        else:
+            frame = _encode(_EV_PUT, _case_fields(case))
+        self.cases[case.case_id] = case
+        self._write(frame)
+
+    # --- journaling ------------------------------------------------------
+
+    def _tracks(self, case: Case) -> bool:
+        return self.cases.get(case.case_id) is case
+
+    def _on_transition(self, case: Case, old: CaseState, new: CaseState) -> None:
+        if self._tracks(case):
+            self._append(_EV_TRANSITION, _case_fields(case))
+
+    def _check_signal(self, case: Case, sig: OutcomeSignal) -> None:
+        if self._tracks(case):
+            self._encoded_signal = (sig, _encode(_EV_SIGNAL, [case.case_id] + _signal_fields(sig)))
+
+    def _on_signal(self, case: Case, sig: OutcomeSignal) -> None:
+        if self._tracks(case):
+            encoded, self._encoded_signal = self._encoded_signal, None
+            if encoded is not None and encoded[0] is sig:
+                self._write(encoded[1])
+            else:
+                self._append(_EV_SIGNAL, [case.case_id] + _signal_fields(sig))
+
+    def _append(self, kind: int, fields: list) -> None:
+        self._write(_encode(kind, fields))
+
+    def _write(self, frame: bytes) -> None:
+        self._log.write(frame)
+        if self.durability != "none":
+            self._log.flush()
+            if self.durability == "fsync":
+                os.fsync(self._log.fileno())
+        self._events_since_snapshot += 1
+        if self.snapshot_every and self._events_since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def sync(self) -> None:
+        """Flushes and fsyncs the current log segment."""
+        self._log.flush()
+        os.fsync(self._log.fileno())
+
+    # --- snapshots & recovery --------------------------------------------
+
+    def _log_path(self, gen: int) -> str:
+        return os.path.join(self.directory, f"events.{gen:08d}.log")
+
+    def _snapshot_path(self, gen: int) -> str:
+        return os.path.join(self.directory, f"snapshot.{gen:08d}.bin")
+
+    def _generations(self, prefix: str) -> List[int]:
+        gens = []
+        for name in os.listdir(self.directory):
+            if name.startswith(prefix + ".") and not name.endswith(".tmp"):
+                gens.append(int(name.split(".")[1]))
+        return sorted(gens)
+
+    def snapshot(self) -> None:
+        """
+        Writes every case to snapshot.<gen>.bin (covering log segments <= gen),
+        then rotates to a new log segment and removes superseded files.
+        """
+        self.sync()
+        self._log.close()
+        gen = self._log_gen
+
+        final_path = self._snapshot_path(gen)
+        tmp_path = final_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            for case in self.cases.values():
+                f.write(_encode(_SNAP_CASE, _snapshot_fields(case)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, final_path)
+
+        self._log_gen = gen + 1
+        self._log = open(self._log_path(self._log_gen), "ab")
+        self._events_since_snapshot = 0
+
+        for old in self._generations("snapshot"):
+            if old < gen:
+                os.remove(self._snapshot_path(old))
+        for old in self._generations("events"):
+            if old <= gen:
+                os.remove(self._log_path(old))
+
+    def _recover(self) -> int:
+        """Loads the latest snapshot and replays newer log segments. Returns the active log gen."""
+        snapshots = self._generations("snapshot")
+        snap_gen = snapshots[-1] if snapshots else -1
+        if snapshots:
+            for kind, fields, _ in _read_frames(self._snapshot_path(snap_gen)):
+                if kind == _SNAP_CASE:
+                    self._load_case(fields)
+
+        # Recovery applies records directly: no validators, listeners or
+        # dedup run, so other listener owners see nothing of it.
+        logs = [g for g in self._generations("events") if g > snap_gen]
+        for gen in logs:
+            path = self._log_path(gen)
+            good = 0
+            for kind, fields, end in _read_frames(path):
+                self._apply_event(kind, fields)
+                good = end
+            if good != os.path.getsize(path):
+                # Drop a torn tail record so new appends start on a frame boundary.
+                with open(path, "r+b") as f:
+                    f.truncate(good)
+        return logs[-1] if logs else snap_gen + 1
+
+    def _load_case(self, fields: list) -> Case:
+        """Builds a fresh case from _SNAP_CASE / _EV_REPLACE fields, replacing any loaded one."""
+        case = self.cases[fields[0]] = Case(case_id=fields[0])
+        self._apply_case_fields(fields[:6])
+        for signal_id, source, outcome, confidence, received_at, meta in fields[6]:
+            case.signals[signal_id] = OutcomeSignal(
+                case_id=case.case_id,
+                source=source,
+                outcome=outcome,
+                confidence=confidence,
+                received_at=received_at,
+                signal_id=signal_id,
+                meta=meta or {},
+            )
+        case.rebuild_indexes()
+        return case
+
+    def _apply_case_fields(self, fields: list) -> Case:
+        case_id, state, final_outcome, settled_at, settlement_id, reason = fields
+        case = self.cases.get(case_id)
+        if case is None:
+            case = self.cases[case_id] = Case(case_id=case_id)
+        case.state = _STATE_BY_VALUE[state]
+        case.final_outcome = final_outcome
+        case.settled_at = settled_at
+        case.settlement_id = settlement_id
+        case.reconciliation_reason = reason
+        return case
+
+    def _apply_event(self, kind: int, fields: list) -> None:
+        if kind in (_EV_PUT, _EV_TRANSITION):
+            self._apply_case_fields(fields)
+        elif kind == _EV_REPLACE:
+            self._load_case(fields)
+        elif kind == _EV_SIGNAL:
+            case_id, signal_id, source, outcome, confidence, received_at, meta = fields
+            case = self.cases.get(case_id)
+            if case is None:
+                case = self.cases[case_id] = Case(case_id=case_id)
+            # Reproduces the provisional / reconciliation state and reason
+            # that the original ingest produced, without its hooks.
+            restore_signal(case, OutcomeSignal(
+                case_id=case_id,
+                source=source,
+                outcome=outcome,
+                confidence=confidence,
+                received_at=received_at,
+                signal_id=signal_id,
+                meta=meta or {},
+            ))
+
+    def close(self) -> None:
+        events.remove_signal_validator(self._check_signal)
+        events.remove_transition_listener(self._on_transition)
+        events.remove_signal_listener(self._on_signal)
+        self.sync()
+        self._log.close()
+
+    def __enter__(self) -> "EventLogStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+@dataclass
+class TierStats:
+    hits: int = 0           # get_case served from the hot tier
+    misses: int = 0         # get_case that went to the cold tier
+    cold_loads: int = 0     # misses the cold tier could answer
+    evictions: int = 0      # cases dropped by the size bounds
+    paged_out: int = 0      # SETTLED cases dropped after write-back
+    writebacks: int = 0     # dirty cases written to the cold tier
+    write_batches: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TieredStore:
+    """
+    Hot/cold tiering in front of a durable store (same interface as
+    InMemoryStore; the cold tier is typically a SQLiteStore).
+
+    - The hot tier is an LRU of at most `max_hot` cases and, optionally,
+      `max_hot_signals` signals in total; the least recently used cases are
+      evicted past either bound.
+    - put_case and any signal ingest / set_state on a resident case mark it
+      dirty. Dirty cases are written back in batches of `write_batch`,
+      before eviction, and on flush() / close().
+    - Cases that reach SETTLED are paged out after their next write-back
+      and reloaded from the cold tier on the next get_case.
+
+    Resident memory therefore follows the active (OPEN / provisional /
+    reconciling / FINAL) cases rather than every case ever seen. Evicted
+    and paged-out Case objects are detached: get_case again rather than
+    holding on to them.
+    """
+
+    def __init__(
+        self,
+        cold: Any,
+        max_hot: int = 100_000,
+        max_hot_signals: Optional[int] = None,
+        write_batch: int = 1024,
+    ) -> None:
+        if max_hot < 1 or write_batch < 1:
+            raise ValueError("max_hot and write_batch must be >= 1")
+        self.cold = cold
+        self.max_hot = max_hot
+        self.max_hot_signals = max_hot_signals
+        self.write_batch = write_batch
+        self.stats = TierStats()
+        self._hot: "OrderedDict[str, Case]" = OrderedDict()
+        self._hot_signals = 0
+        self._dirty: Dict[str, None] = {}
+        self._settled: Dict[str, None] = {}
+        events.add_transition_listener(self._on_transition)
+        events.add_signal_listener(self._on_signal)
+
+    @property
+    def resident_cases(self) -> int:
+        return len(self._hot)
+
+    @property
+    def resident_signals(self) -> int:
+        return self._hot_signals
+
+    def is_resident(self, case_id: str) -> bool:
+        return case_id in self._hot
+
+    # --- store interface -------------------------------------------------
+
+    def get_case(self, case_id: str) -> Optional[Case]:
+        case = self._hot.get(case_id)
+        if case is not None:
+            self._hot.move_to_end(case_id)
+            self.stats.hits += 1
+            return case
+        self.stats.misses += 1
+        case = self.cold.get_case(case_id)
+        if case is not None:
+            self.stats.cold_loads += 1
+            self._admit(case)
+            self._enforce_bounds(keep=case_id)
+        return case
+
+    def put_case(self, case: Case) -> None:
+        old = self._hot.get(case.case_id)
+        if old is not case:
+            if old is not None:
+                self._hot_signals -= len(old.signals)
+            self._admit(case)
+        else:
+            self._hot.move_to_end(case.case_id)
+        self._mark_dirty(case)
+        self._enforce_bounds(keep=case.case_id)
+
+    def flush(self) -> None:
+        """Writes back every dirty case and pages out settled ones."""
+        self._write_back(list(self._dirty))
+        if hasattr(self.cold, "flush"):
+            self.cold.flush()
+
+    def close(self) -> None:
+        events.remove_transition_listener(self._on_transition)
+        events.remove_signal_listener(self._on_signal)
+        self.flush()
+        if hasattr(self.cold, "close"):
+            self.cold.close()
+
+    def __enter__(self) -> "TieredStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # --- tier management -------------------------------------------------
+
+    def _admit(self, case: Case) -> None:
+        self._hot[case.case_id] = case
+        self._hot.move_to_end(case.case_id)
+        self._hot_signals += len(case.signals)
+
+    def _mark_dirty(self, case: Case) -> None:
+        self._dirty[case.case_id] = None
+        if case.state == CaseState.SETTLED:
+            self._settled[case.case_id] = None
+        if len(self._dirty) >= self.write_batch:
+            self._write_back(list(self._dirty), keep=case.case_id)
+
+    # The case being mutated becomes MRU and is never evicted or paged out
+    # by the bounds it triggers: the caller is still writing to that object.
+
+    def _on_transition(self, case: Case, old: CaseState, new: CaseState) -> None:
+        if self._hot.get(case.case_id) is case:
+            self._hot.move_to_end(case.case_id)
+            self._mark_dirty(case)
+
+    def _on_signal(self, case: Case, sig: OutcomeSignal) -> None:
+        if self._hot.get(case.case_id) is case:
+            self._hot.move_to_end(case.case_id)
+            self._hot_signals += 1
+            self._mark_dirty(case)
+            if self.max_hot_signals is not None and self._hot_signals > self.max_hot_signals:
+                self._enforce_bounds(keep=case.case_id)
+
+    def _write_back(self, case_ids: List[str], keep: Optional[str] = None) -> None:
+        if not case_ids:
+            return
+        for case_id in case_ids:
+            self.cold.put_case(self._hot[case_id])
+            del self._dirty[case_id]
+        if hasattr(self.cold, "flush"):
+            self.cold.flush()
+        self.stats.writebacks += len(case_ids)
+        self.stats.write_batches += 1
+        # Settled cases are only read from now on; drop them once durable.
+        for case_id in list(self._settled):
+            if case_id not in self._dirty and case_id != keep:
+                del self._settled[case_id]
+                self._drop(case_id)
+                self.stats.paged_out += 1
+
+    def _drop(self, case_id: str) -> None:
+        case = self._hot.pop(case_id, None)
+        if case is not None:
+            self._hot_signals -= len(case.signals)
+
+    def _enforce_bounds(self, keep: Optional[str] = None) -> None:
+        def over() -> bool:
+            return len(self._hot) - len(victims) > self.max_hot or (
+                self.max_hot_signals is not None and self._hot_signals - victim_signals > self.max_hot_signals
+            )
+
+        victims: List[str] = []
+        victim_signals = 0
+        # `keep` (the case that triggered this) stays, even if it alone is over the bounds.
+        candidates = (case_id for case_id in self._hot if case_id != keep)
+        while over():
+            case_id = next(candidates, None)
+            if case_id is None:
+                break
+            victims.append(case_id)
+            victim_signals += len(self._hot[case_id].signals)
+        if not victims:
+            return
+        self._write_back([case_id for case_id in victims if case_id in self._dirty], keep=keep)
+        for case_id in victims:
+            if case_id in self._hot:
+                self._drop(case_id)
+                self.stats.evictions += 1